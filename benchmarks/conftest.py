@@ -0,0 +1,210 @@
+import json
+import os
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from statistics import quantiles
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest import fail, fixture
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from diary.models import Note, Tag
+
+User = get_user_model()
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+SCALES = [
+    int(scale) for scale in os.getenv('BENCHMARK_SCALES', '10,1000').split(',')
+]
+TAGS_PER_SCALE = {10: 10, 1000: 100, 100_000: 500}
+TAGS_PER_NOTE = 3
+REPEAT = int(os.getenv('BENCHMARK_REPEAT', 20))
+LATENCY_TOLERANCE = float(os.getenv('BENCHMARK_LATENCY_TOLERANCE', 3))
+MEMORY_TOLERANCE = float(os.getenv('BENCHMARK_MEMORY_TOLERANCE', 1.5))
+SEED_BATCH_SIZE = 5000
+USER_PASSWORD = 'B3nchm@rkP@55'
+
+results = {}
+
+
+@dataclass
+class Measurement:
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    peak_kib: float
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--update-baseline',
+        action='store_true',
+        help='Store measured results as the new benchmark baseline.',
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if 'scale' in metafunc.fixturenames:
+        metafunc.parametrize('scale', SCALES)
+
+
+def pytest_sessionfinish(session):
+    if results and session.config.getoption('--update-baseline'):
+        baseline = _load_baseline() | {
+            name: asdict(measurement) for name, measurement in results.items()
+        }
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n'
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not results:
+        return
+
+    terminalreporter.section('benchmark results')
+    terminalreporter.write_line(
+        f'{"name":<40} {"queries":>7} {"p50 ms":>9} {"p95 ms":>9} '
+        f'{"peak KiB":>10}'
+    )
+    for name, measurement in sorted(results.items()):
+        terminalreporter.write_line(
+            f'{name:<40} {measurement.queries:>7} {measurement.p50_ms:>9.2f} '
+            f'{measurement.p95_ms:>9.2f} {measurement.peak_kib:>10.1f}'
+        )
+
+
+def _load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def _seed_user(scale: int) -> None:
+    user = User.objects.create_user(f'bench_{scale}', password=USER_PASSWORD)
+    Token.objects.create(user=user)
+
+    tags = Tag.objects.bulk_create(
+        Tag(author=user, name=f'tag_{i}')
+        for i in range(TAGS_PER_SCALE.get(scale, 500))
+    )
+    NoteTag = Note.tags.through
+    for start in range(0, scale, SEED_BATCH_SIZE):
+        notes = Note.objects.bulk_create(
+            Note(
+                author=user,
+                title=f'Note {i}',
+                text=f'Benchmark note number {i}. ' * 20,
+            )
+            for i in range(start, min(start + SEED_BATCH_SIZE, scale))
+        )
+        NoteTag.objects.bulk_create(
+            NoteTag(note=note, tag=tags[(note.id + shift) % len(tags)])
+            for note in notes
+            for shift in range(TAGS_PER_NOTE)
+        )
+
+
+@fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        for scale in SCALES:
+            _seed_user(scale)
+
+
+@fixture
+def bench_user(scale, db):
+    return User.objects.get(username=f'bench_{scale}')
+
+
+@fixture
+def bench_client(bench_user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=bench_user).key}'
+    )
+    return client
+
+
+@fixture
+def user_password():
+    return USER_PASSWORD
+
+
+@fixture
+def benchmark(request, scale):
+    """Measure a request and compare it with the stored baseline.
+
+    `run` is called with the iteration number and must perform exactly
+    one request. `setup`, if given, runs before each iteration and is
+    excluded from measurements. The response cache is cleared before
+    each iteration, so the uncached path is measured.
+    """
+
+    def _benchmark(run, setup=None):
+        def call(iteration):
+            if setup is not None:
+                setup(iteration)
+            cache.clear()
+
+        call(0)
+        with CaptureQueriesContext(connection) as queries:
+            run(0)
+        query_count = len(queries)
+
+        timings = []
+        for iteration in range(1, REPEAT + 1):
+            call(iteration)
+            started = perf_counter()
+            run(iteration)
+            timings.append((perf_counter() - started) * 1000)
+
+        call(REPEAT + 1)
+        tracemalloc.start()
+        run(REPEAT + 1)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        percentiles = quantiles(timings, n=100)
+        measurement = Measurement(
+            queries=query_count,
+            p50_ms=round(percentiles[49], 3),
+            p95_ms=round(percentiles[94], 3),
+            peak_kib=round(peak / 1024, 1),
+        )
+        name = request.node.name
+        results[name] = measurement
+        _compare_with_baseline(name, measurement, request.config)
+        return measurement
+
+    return _benchmark
+
+
+def _compare_with_baseline(name, measurement, config):
+    if config.getoption('--update-baseline'):
+        return
+    if (baseline := _load_baseline().get(name)) is None:
+        return
+
+    if measurement.queries > baseline['queries']:
+        fail(
+            f'{name}: {measurement.queries} queries, '
+            f'baseline is {baseline["queries"]}'
+        )
+    if measurement.p95_ms > baseline['p95_ms'] * LATENCY_TOLERANCE:
+        fail(
+            f'{name}: p95 latency {measurement.p95_ms} ms, '
+            f'baseline is {baseline["p95_ms"]} ms'
+        )
+    if measurement.peak_kib > baseline['peak_kib'] * MEMORY_TOLERANCE:
+        fail(
+            f'{name}: peak memory {measurement.peak_kib} KiB, '
+            f'baseline is {baseline["peak_kib"]} KiB'
+        )
@@ -0,0 +1,300 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+from pytest import fixture, mark
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from diary.models import Note, Tag
+
+pytestmark = mark.django_db
+
+
+@fixture
+def some_note(bench_user):
+    return Note.objects.filter(author=bench_user).first()
+
+
+@fixture
+def some_tag(bench_user):
+    return Tag.objects.filter(author=bench_user).first()
+
+
+def assert_status(response, status_code):
+    assert response.status_code == status_code, response.content
+
+
+def test_notes_list(benchmark, bench_client):
+    url = reverse('api:notes-list')
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_notes_list_sparse(benchmark, bench_client):
+    url = reverse('api:notes-list') + '?omit=text'
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_notes_list_date_window(benchmark, bench_client):
+    url = reverse('api:notes-list') + (
+        f'?created_after={date.today() - timedelta(days=7)}'
+        '&ordering=created_at'
+    )
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_notes_search(benchmark, bench_client):
+    url = reverse('api:notes-list') + '?q=number'
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_notes_export(benchmark, bench_client):
+    url = reverse('api:notes-export')
+
+    def run(_):
+        response = bench_client.get(url)
+        assert_status(response, status.HTTP_200_OK)
+        for _ in response.streaming_content:
+            pass
+
+    benchmark(run)
+
+
+def test_notes_retrieve(benchmark, bench_client, some_note):
+    url = reverse('api:notes-detail', kwargs={'pk': some_note.pk})
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_notes_create(benchmark, bench_client):
+    url = reverse('api:notes-list')
+    benchmark(
+        lambda i: assert_status(
+            bench_client.post(
+                url,
+                data={
+                    'title': f'Created {i}',
+                    'text': 'Created note',
+                    'tags': ['tag_0', 'tag_1', f'new_tag_{i}'],
+                },
+            ),
+            status.HTTP_201_CREATED,
+        )
+    )
+
+
+def test_notes_update(benchmark, bench_client, some_note):
+    url = reverse('api:notes-detail', kwargs={'pk': some_note.pk})
+    benchmark(
+        lambda i: assert_status(
+            bench_client.put(
+                url,
+                data={
+                    'title': f'Updated {i}',
+                    'text': 'Updated note',
+                    'tags': ['tag_0', f'tag_{i % 5 + 1}'],
+                },
+            ),
+            status.HTTP_200_OK,
+        )
+    )
+
+
+def test_notes_destroy(benchmark, bench_client, bench_user):
+    notes = {}
+
+    def setup(i):
+        notes[i] = Note.objects.create(author=bench_user, title=f'Delete {i}')
+
+    benchmark(
+        lambda i: assert_status(
+            bench_client.delete(
+                reverse('api:notes-detail', kwargs={'pk': notes[i].pk})
+            ),
+            status.HTTP_204_NO_CONTENT,
+        ),
+        setup=setup,
+    )
+
+
+BULK_SIZE = 100
+
+
+def test_notes_bulk_delete(benchmark, bench_client, bench_user):
+    ids = {}
+
+    def setup(i):
+        ids[i] = [
+            note.id
+            for note in Note.objects.bulk_create(
+                Note(author=bench_user, title=f'Bulk delete {i} {j}')
+                for j in range(BULK_SIZE)
+            )
+        ]
+
+    benchmark(
+        lambda i: assert_status(
+            bench_client.post(
+                reverse('api:notes-bulk-delete'),
+                data={'ids': ids[i]},
+                format='json',
+            ),
+            status.HTTP_200_OK,
+        ),
+        setup=setup,
+    )
+
+
+def test_notes_bulk_tags(benchmark, bench_client, bench_user):
+    ids = list(
+        Note.objects.filter(author=bench_user).values_list('id', flat=True)[
+            :BULK_SIZE
+        ]
+    )
+    benchmark(
+        lambda i: assert_status(
+            bench_client.post(
+                reverse('api:notes-bulk-tags'),
+                data={'ids': ids, 'add': [f'bulk_{i}'], 'remove': ['tag_0']},
+                format='json',
+            ),
+            status.HTTP_200_OK,
+        )
+    )
+
+
+def test_async_notes_list(benchmark, bench_client):
+    url = reverse('api:async-notes-list')
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_async_notes_retrieve(benchmark, bench_client, some_note):
+    url = reverse('api:async-notes-detail', kwargs={'pk': some_note.pk})
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_async_notes_create(benchmark, bench_client):
+    url = reverse('api:async-notes-list')
+    benchmark(
+        lambda i: assert_status(
+            bench_client.post(
+                url,
+                data={
+                    'title': f'Created async {i}',
+                    'text': 'Created note',
+                    'tags': ['tag_0', 'tag_1', f'new_async_tag_{i}'],
+                },
+                format='json',
+            ),
+            status.HTTP_201_CREATED,
+        )
+    )
+
+
+def test_tags_list(benchmark, bench_client):
+    url = reverse('api:tags-list')
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_tags_cloud(benchmark, bench_client):
+    url = reverse('api:tags-cloud')
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_tags_retrieve(benchmark, bench_client, some_tag):
+    url = reverse('api:tags-detail', kwargs={'pk': some_tag.pk})
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
+
+
+def test_tags_create(benchmark, bench_client):
+    url = reverse('api:tags-list')
+    benchmark(
+        lambda i: assert_status(
+            bench_client.post(url, data={'name': f'created_{i}'}),
+            status.HTTP_201_CREATED,
+        )
+    )
+
+
+def test_tags_update(benchmark, bench_client, some_tag):
+    url = reverse('api:tags-detail', kwargs={'pk': some_tag.pk})
+    benchmark(
+        lambda i: assert_status(
+            bench_client.put(url, data={'name': f'updated_{i}'}),
+            status.HTTP_200_OK,
+        )
+    )
+
+
+def test_tags_destroy(benchmark, bench_client, bench_user):
+    tags = {}
+
+    def setup(i):
+        tags[i] = Tag.objects.create(author=bench_user, name=f'delete_{i}')
+
+    benchmark(
+        lambda i: assert_status(
+            bench_client.delete(
+                reverse('api:tags-detail', kwargs={'pk': tags[i].pk})
+            ),
+            status.HTTP_204_NO_CONTENT,
+        ),
+        setup=setup,
+    )
+
+
+def test_auth_login(benchmark, bench_user, user_password):
+    client = APIClient()
+    url = reverse('api:login')
+    benchmark(
+        lambda _: assert_status(
+            client.post(
+                url,
+                data={
+                    'username': bench_user.username,
+                    'password': user_password,
+                },
+            ),
+            status.HTTP_200_OK,
+        )
+    )
+
+
+def test_auth_logout(benchmark, bench_user):
+    client = APIClient()
+    url = reverse('api:logout')
+
+    def setup(_):
+        token, _ = Token.objects.get_or_create(user=bench_user)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    benchmark(
+        lambda _: assert_status(client.post(url), status.HTTP_204_NO_CONTENT),
+        setup=setup,
+    )
+
+
+def test_auth_profile(benchmark, bench_client):
+    url = reverse('api:user-me')
+    benchmark(
+        lambda _: assert_status(bench_client.get(url), status.HTTP_200_OK)
+    )
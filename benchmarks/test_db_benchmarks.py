@@ -0,0 +1,40 @@
+from django.db import connections, DEFAULT_DB_ALIAS
+from pytest import fixture, mark
+
+pytestmark = mark.django_db
+
+CONNECTION_SETTINGS = {
+    'connect_per_request': {'CONN_MAX_AGE': 0},
+    'persistent': {'CONN_MAX_AGE': 60},
+    'pool': {
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {'pool': {'min_size': 1, 'max_size': 1}},
+    },
+}
+
+
+@fixture(params=CONNECTION_SETTINGS)
+def db_wrapper(request):
+    """Separate connection to the test database with given settings.
+
+    It keeps the default alias, which django.contrib.postgres looks up on
+    connect, so the benchmarks must run without DB_POOL.
+    """
+    default = connections[DEFAULT_DB_ALIAS]
+    wrapper = type(default)(
+        default.settings_dict | CONNECTION_SETTINGS[request.param]
+    )
+    yield wrapper
+    wrapper.close()
+    wrapper.close_pool()
+
+
+def test_db_connection(benchmark, db_wrapper):
+    """Query once and close connection like Django does after a request."""
+
+    def run(_):
+        with db_wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        db_wrapper.close_if_unusable_or_obsolete()
+
+    benchmark(run)
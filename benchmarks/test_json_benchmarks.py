@@ -0,0 +1,67 @@
+from django.db.models import Count, Prefetch
+from pytest import fixture, mark
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import ORJSONRenderer
+from api.serializers import NoteSerializer, TagSerializer
+from diary.models import Note, Tag
+
+pytestmark = mark.django_db
+
+# Notes per iteration; throughput is this number divided by the latency.
+SERIALIZE_LIMIT = 500
+
+RENDERERS = {'json': JSONRenderer, 'orjson': ORJSONRenderer}
+
+
+def notes_data(author, read_path):
+    notes = Note.objects.filter(author=author).order_by('-created_at', '-id')
+    if read_path == 'instances':
+        return NoteSerializer(
+            notes.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.only('name'))
+            )[:SERIALIZE_LIMIT],
+            many=True,
+        ).data
+
+    serializer = NoteSerializer()
+    return serializer.represent_values(
+        notes.values(*serializer.get_values_fields())[:SERIALIZE_LIMIT]
+    )
+
+
+def tags_data(author, read_path):
+    tags = Tag.objects.filter(author=author).annotate(
+        notes_count=Count('notes')
+    )
+    if read_path == 'instances':
+        return TagSerializer(tags, many=True).data
+
+    serializer = TagSerializer()
+    return serializer.represent_values(
+        tags.values(*serializer.get_values_fields())
+    )
+
+
+@fixture(params=[notes_data, tags_data], ids=['notes', 'tags'])
+def read_data(request):
+    return request.param
+
+
+@fixture
+def expected_output(bench_user, read_data):
+    return JSONRenderer().render(read_data(bench_user, 'instances'))
+
+
+@mark.parametrize('renderer', RENDERERS)
+@mark.parametrize('read_path', ['instances', 'values'])
+def test_serialize_and_render(
+    benchmark, bench_user, read_data, expected_output, read_path, renderer
+):
+    """Read, serialize and render a list, checking bytes are identical."""
+
+    def run(_):
+        output = RENDERERS[renderer]().render(read_data(bench_user, read_path))
+        assert output == expected_output
+
+    benchmark(run)
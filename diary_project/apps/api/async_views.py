@@ -0,0 +1,207 @@
+"""Native async endpoints for serving notes and tags under ASGI.
+
+DRF views are synchronous, so under ASGI every request to them costs a
+thread hop. These views cover the hot list, retrieve and create paths
+with Django's async ORM; everything else is served by ``views``.
+"""
+
+import json
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import IntegrityError
+from django.db.models import Count, Prefetch
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+    NotFound,
+    ParseError,
+    PermissionDenied,
+    ValidationError,
+)
+from rest_framework.utils.encoders import JSONEncoder
+
+from diary.models import Note, Tag
+
+from .authentication import CachedTokenAuthentication
+from .pagination import KeysetPagination, NotesPagination
+from .permissions import IsAuthor
+from .serializers import NoteSerializer, TagSerializer
+
+
+class AsyncAPIView(View):
+    """Base async view with DRF authentication and permission semantics.
+
+    Permission classes must not query the database: their checks are
+    called directly from the event loop.
+    """
+
+    authentication = CachedTokenAuthentication()
+    permission_classes = [IsAuthor]
+    serializer_class = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token authenticated, so CSRF protection does not apply.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.perform_authentication(request)
+            self.check_permissions(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as error:
+            return self.handle_exception(error)
+
+    async def perform_authentication(self, request) -> None:
+        user_auth = await self.authentication.aauthenticate(request)
+        request.user, request.auth = user_auth or (AnonymousUser(), None)
+
+    def get_permissions(self) -> list:
+        return [permission() for permission in self.permission_classes]
+
+    def check_permissions(self, request) -> None:
+        for permission in self.get_permissions():
+            if not permission.has_permission(request, self):
+                self.permission_denied(request)
+
+    def check_object_permissions(self, request, obj) -> None:
+        for permission in self.get_permissions():
+            if not permission.has_object_permission(request, self, obj):
+                self.permission_denied(request)
+
+    def permission_denied(self, request):
+        if not request.user.is_authenticated:
+            raise NotAuthenticated()
+        raise PermissionDenied()
+
+    def handle_exception(self, error: APIException) -> JsonResponse:
+        if isinstance(error.detail, (list, dict)):
+            data = error.detail
+        else:
+            data = {'detail': error.detail}
+
+        response = self.respond(data, status_code=error.status_code)
+        if error.status_code == status.HTTP_401_UNAUTHORIZED:
+            response['WWW-Authenticate'] = (
+                self.authentication.authenticate_header(self.request)
+            )
+        return response
+
+    def respond(self, data, status_code=status.HTTP_200_OK) -> JsonResponse:
+        return JsonResponse(
+            data, status=status_code, encoder=JSONEncoder, safe=False
+        )
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_serializer(self, *args, **kwargs):
+        return self.serializer_class(
+            *args, context={'request': self.request}, **kwargs
+        )
+
+    def parse_body(self, request):
+        try:
+            return json.loads(request.body)
+        except ValueError as error:
+            raise ParseError(f'JSON parse error - {error}')
+
+
+class AsyncListCreateView(AsyncAPIView):
+    ordering = None
+
+    async def get(self, request):
+        paginator = KeysetPagination(self.ordering)
+        page = await paginator.apaginate_queryset(self.get_queryset(), request)
+        return self.respond(
+            paginator.get_paginated_data(
+                self.get_serializer(page, many=True).data
+            )
+        )
+
+    async def post(self, request):
+        serializer = self.get_serializer(data=self.parse_body(request))
+        serializer.is_valid(raise_exception=True)
+        instance = await self.perform_create(serializer.validated_data)
+        return self.respond(
+            self.get_serializer(instance).data,
+            status_code=status.HTTP_201_CREATED,
+        )
+
+    async def perform_create(self, validated_data):
+        raise NotImplementedError
+
+
+class AsyncRetrieveView(AsyncAPIView):
+    async def get(self, request, pk):
+        queryset = self.get_queryset()
+        try:
+            instance = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            raise NotFound(
+                f'No {queryset.model._meta.object_name} matches '
+                'the given query.'
+            )
+        self.check_object_permissions(request, instance)
+        return self.respond(self.get_serializer(instance).data)
+
+
+class AsyncNotesMixin:
+    serializer_class = NoteSerializer
+    ordering = NotesPagination.ordering
+
+    def get_queryset(self):
+        return Note.objects.filter(author=self.request.user).prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.only('name'))
+        )
+
+
+class AsyncTagsMixin:
+    serializer_class = TagSerializer
+    ordering = ['name', 'id']
+
+    def get_queryset(self):
+        return Tag.objects.filter(author=self.request.user).annotate(
+            notes_count=Count('notes')
+        )
+
+
+class AsyncNotesListView(AsyncNotesMixin, AsyncListCreateView):
+    async def perform_create(self, validated_data):
+        data = dict(validated_data)
+        tags = data.pop('tags')
+        author = self.request.user
+
+        try:
+            note = await Note.objects.acreate(author=author, **data)
+        except IntegrityError:
+            raise ValidationError(f'Note with title {data["title"]} exists!')
+        await note.tags.aset(
+            await Tag.objects.aget_or_create_many(author, tags)
+        )
+
+        return await self.get_queryset().aget(pk=note.pk)
+
+
+class AsyncNotesDetailView(AsyncNotesMixin, AsyncRetrieveView):
+    pass
+
+
+class AsyncTagsListView(AsyncTagsMixin, AsyncListCreateView):
+    async def perform_create(self, validated_data):
+        try:
+            return await Tag.objects.acreate(
+                author=self.request.user, **validated_data
+            )
+        except IntegrityError:
+            raise ValidationError(
+                f'Tag with name {validated_data["name"]} exists!'
+            )
+
+
+class AsyncTagsDetailView(AsyncTagsMixin, AsyncRetrieveView):
+    pass
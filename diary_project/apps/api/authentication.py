@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import (
+    get_authorization_header,
+    TokenAuthentication,
+)
+from rest_framework.exceptions import AuthenticationFailed
+
+from .metrics import record_cache_lookup
+
+
+class AsyncTokenAuthentication(TokenAuthentication):
+    """Token authentication with async variants for async views."""
+
+    async def aauthenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _('Invalid token header. No credentials provided.')
+            raise AuthenticationFailed(msg)
+        elif len(auth) > 2:
+            msg = _(
+                'Invalid token header. Token string should not contain spaces.'
+            )
+            raise AuthenticationFailed(msg)
+
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            msg = _(
+                'Invalid token header. '
+                'Token string should not contain invalid characters.'
+            )
+            raise AuthenticationFailed(msg)
+
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related('user').aget(key=key)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return token.user, token
+
+
+def token_cache_key(key: str) -> str:
+    return f'auth-token:{key}'
+
+
+def invalidate_cached_tokens(keys) -> None:
+    """Drop resolved tokens from cache, e.g. on logout or user change."""
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(AsyncTokenAuthentication):
+    """Token authentication caching resolved tokens with their users.
+
+    Cached requests skip the token query entirely. Entries expire after
+    AUTH_TOKEN_CACHE_TIMEOUT seconds and are invalidated by signals on
+    logout and when the user is saved or deleted. Other token deletes and
+    bulk ``update()`` calls on users take effect after the timeout.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        record_cache_lookup('auth_token', token is not None)
+        if token is None:
+            _, token = super().authenticate_credentials(key)
+            cache.set(cache_key, token, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        return token.user, token
+
+    async def aauthenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = await cache.aget(cache_key)
+        record_cache_lookup('auth_token', token is not None)
+        if token is None:
+            _, token = await super().aauthenticate_credentials(key)
+            await cache.aset(
+                cache_key, token, settings.AUTH_TOKEN_CACHE_TIMEOUT
+            )
+        return token.user, token
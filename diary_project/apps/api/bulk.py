@@ -0,0 +1,226 @@
+import codecs
+import json
+from itertools import chain, islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.timezone import now
+from rest_framework.exceptions import ParseError
+
+from diary.models import Note, Tag
+
+from .cache import invalidate_user_cache
+from .serializers import NoteImportSerializer
+from .stats import add_to_daily_stats
+
+IMPORT_BATCH_SIZE = 500
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def iter_ndjson(stream):
+    """Yield objects from newline-delimited JSON stream.
+
+    Lines which are not valid JSON are yielded as `ValueError`, so the
+    caller can report them without aborting the whole stream.
+    """
+    if stream is None:
+        return
+
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield error
+
+
+def iter_json_array(stream):
+    """Yield items of JSON array stream, decoding it chunk by chunk."""
+    if stream is None:
+        return
+
+    decoder = json.JSONDecoder()
+    chunks = _iter_text(stream)
+
+    buffer = _fill_buffer(chunks, '')
+    if not buffer.startswith('['):
+        raise ParseError('Expected JSON array.')
+    buffer = _fill_buffer(chunks, buffer[1:])
+
+    while not buffer.startswith(']'):
+        item, buffer = _decode_item(decoder, chunks, buffer)
+        yield item
+
+        buffer = _fill_buffer(chunks, buffer)
+        if buffer.startswith(','):
+            buffer = _fill_buffer(chunks, buffer[1:])
+        elif not buffer.startswith(']'):
+            raise ParseError('Malformed JSON array.')
+
+
+def _iter_text(stream):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in iter(lambda: stream.read(READ_CHUNK_SIZE), b''):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def _fill_buffer(chunks, buffer: str) -> str:
+    buffer = buffer.lstrip()
+    while not buffer:
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ParseError('Unexpected end of JSON array.')
+        buffer = chunk.lstrip()
+    return buffer
+
+
+def _decode_item(decoder, chunks, buffer: str):
+    while True:
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except ValueError:
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ParseError('Malformed JSON array.')
+            buffer += chunk
+        else:
+            return item, buffer[end:]
+
+
+def import_notes(author, rows) -> dict:
+    """Create author's notes from rows in batches.
+
+    Invalid rows are reported by their index and do not stop the import.
+    """
+    created_count = 0
+    errors = []
+
+    rows = enumerate(rows)
+    while batch := list(islice(rows, IMPORT_BATCH_SIZE)):
+        created_count += _import_batch(author, batch, errors)
+
+    if created_count:
+        invalidate_user_cache(author.id)
+
+    errors.sort(key=lambda error: error['row'])
+    return {'created': created_count, 'errors': errors}
+
+
+def _import_batch(author, batch, errors) -> int:
+    validated_rows = []
+    for index, row in batch:
+        if isinstance(row, ValueError):
+            errors.append({'row': index, 'errors': [f'Invalid JSON: {row}']})
+            continue
+
+        serializer = NoteImportSerializer(data=row)
+        if serializer.is_valid():
+            validated_rows.append((index, serializer.validated_data))
+        else:
+            errors.append({'row': index, 'errors': serializer.errors})
+
+    existing_titles = set(
+        Note.objects.filter(
+            author=author,
+            title__in=[data['title'] for _, data in validated_rows],
+        ).values_list('title', flat=True)
+    )
+
+    indexes, notes, notes_tags = [], [], []
+    for index, data in validated_rows:
+        if data['title'] in existing_titles:
+            errors.append(
+                {
+                    'row': index,
+                    'errors': [f'Note with title {data["title"]} exists!'],
+                }
+            )
+            continue
+        existing_titles.add(data['title'])
+
+        indexes.append(index)
+        notes_tags.append(set(data.pop('tags')))
+        notes.append(Note(author=author, **data))
+
+    if not notes:
+        return 0
+
+    tags = {
+        tag.name: tag
+        for tag in Tag.objects.get_or_create_many(
+            author, chain.from_iterable(notes_tags)
+        )
+    }
+    NoteTag = Note.tags.through
+
+    try:
+        with transaction.atomic():
+            Note.objects.bulk_create(notes)
+            add_to_daily_stats(notes)
+            NoteTag.objects.bulk_create(
+                NoteTag(note=note, tag=tags[name])
+                for note, names in zip(notes, notes_tags)
+                for name in names
+            )
+    except IntegrityError:
+        errors.extend(
+            {'row': index, 'errors': ['Conflicting concurrent write.']}
+            for index in indexes
+        )
+        return 0
+
+    return len(notes)
+
+
+def delete_notes(author, notes) -> int:
+    """Delete author's notes selected by queryset in one transaction.
+
+    Takes the same few queries for any number of notes.
+    """
+    with transaction.atomic():
+        _, deleted = (
+            notes.filter(author=author).prefetch_related(None).delete()
+        )
+    return deleted.get(Note._meta.label, 0)
+
+
+def retag_notes(author, notes, add, remove) -> int:
+    """Add and remove tags of author's notes selected by queryset.
+
+    Links are written straight to the through table in one transaction,
+    with the same few queries for any number of notes.
+    """
+    NoteTag = Note.tags.through
+
+    with transaction.atomic():
+        note_ids = list(
+            notes.filter(author=author)
+            .prefetch_related(None)
+            .values_list('id', flat=True)
+        )
+        if not note_ids:
+            return 0
+
+        if remove:
+            NoteTag.objects.filter(
+                note_id__in=note_ids,
+                tag__author=author,
+                tag__name__in=remove,
+            ).delete()
+        if add:
+            NoteTag.objects.bulk_create(
+                [
+                    NoteTag(note_id=note_id, tag=tag)
+                    for tag in Tag.objects.get_or_create_many(author, add)
+                    for note_id in note_ids
+                ],
+                ignore_conflicts=True,
+            )
+        Note.objects.filter(id__in=note_ids).update(
+            updated_at=now(), version=F('version') + 1
+        )
+
+    invalidate_user_cache(author.id)
+    return len(note_ids)
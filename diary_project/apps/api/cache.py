@@ -0,0 +1,82 @@
+from time import time_ns
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .metrics import record_cache_lookup
+
+
+def _user_version_key(user_id) -> str:
+    return f'user-cache-version:{user_id}'
+
+
+def get_user_cache_version(user_id) -> int:
+    """Get time of the last change to user's data in nanoseconds.
+
+    If the version was evicted from cache, current time is used, which
+    only makes clients refetch data.
+    """
+    return cache.get_or_set(_user_version_key(user_id), time_ns, None)
+
+
+def invalidate_user_cache(user_id) -> None:
+    """Make every cached response of the user stale."""
+    cache.set(_user_version_key(user_id), time_ns(), None)
+
+
+class CachedListMixin:
+    """Cache list responses per user, filter params and page."""
+
+    def list(self, request, *args, **kwargs):
+        cache_key = self.get_list_cache_key(request)
+        data = cache.get(cache_key)
+        record_cache_lookup('list', data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, settings.LIST_CACHE_TIMEOUT)
+        return response
+
+    def get_list_cache_key(self, request) -> str:
+        user_id = request.user.id
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        return (
+            f'{self.basename}-list:{user_id}:'
+            f'{get_user_cache_version(user_id)}:{query}'
+        )
+
+
+class ConditionalGetMixin:
+    """Answer list and retrieve with 304 while user's data is unchanged.
+
+    ETag and Last-Modified come from the user's cache version, so the
+    check runs before any query or serialization.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_get(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_get(
+            request, super().retrieve, *args, **kwargs
+        )
+
+    def get_etag(self, request, version: int) -> str:
+        return f'"{version}-{request.accepted_renderer.format}"'
+
+    def _conditional_get(self, request, handler, *args, **kwargs):
+        version = get_user_cache_version(request.user.id)
+        etag = self.get_etag(request, version)
+        last_modified = version // 10**9
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        ) or handler(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
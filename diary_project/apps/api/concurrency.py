@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from diary.models import VersionConflict
+
+from .cache import get_user_cache_version
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'Object was changed since the given version.'
+    default_code = 'precondition_failed'
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Object was changed by a concurrent request.'
+    default_code = 'conflict'
+
+
+class OptimisticUpdateMixin:
+    """Reject updates of changed objects, with optional ``If-Match``.
+
+    If-Match accepts ``"<version>"`` of the object, ``*`` or the ETag of
+    an earlier GET, which still holds only while none of the user's data
+    changed. The version is checked again by the UPDATE itself.
+    """
+
+    def perform_update(self, serializer):
+        if (if_match := self.request.headers.get('If-Match')) is not None:
+            self.check_if_match(if_match, serializer.instance)
+
+        try:
+            with transaction.atomic():
+                super().perform_update(serializer)
+        except VersionConflict:
+            if if_match is not None:
+                raise PreconditionFailed()
+            raise Conflict()
+
+    def check_if_match(self, if_match: str, instance) -> None:
+        etags = parse_etags(if_match)
+        if '*' in etags or f'"{instance.version}"' in etags:
+            return
+        user_version = get_user_cache_version(self.request.user.id)
+        if self.get_etag(self.request, user_version) not in etags:
+            raise PreconditionFailed()
@@ -0,0 +1,42 @@
+import csv
+import json
+
+from rest_framework.utils.encoders import JSONEncoder
+
+EXPORT_CHUNK_SIZE = 1000
+CSV_FIELDS = ['id', 'created_at', 'title', 'text', 'tags', 'version']
+
+
+def _dumps(row) -> str:
+    return json.dumps(row, cls=JSONEncoder, ensure_ascii=False)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield _dumps(row) + '\n'
+
+
+def render_json(rows):
+    yield '['
+    for index, row in enumerate(rows):
+        yield (',' if index else '') + _dumps(row)
+    yield ']'
+
+
+def render_csv(rows):
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_FIELDS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row | {'tags': ','.join(row['tags'])})
+
+
+EXPORT_RENDERERS = {
+    'ndjson': ('application/x-ndjson', render_ndjson),
+    'json': ('application/json', render_json),
+    'csv': ('text/csv', render_csv),
+}
@@ -1,5 +1,18 @@
-from django_filters import CharFilter, FilterSet, ModelMultipleChoiceFilter
+from datetime import datetime, time, timedelta
 
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Count, F, Q
+from django.utils.timezone import make_aware
+from django_filters import (
+    CharFilter,
+    DateFilter,
+    DateTimeFilter,
+    FilterSet,
+    ModelMultipleChoiceFilter,
+    OrderingFilter,
+)
+
+from diary.constants import MIN_SUBSTRING_SEARCH_LENGTH, SEARCH_CONFIG
 from diary.models import Note, Tag
 
 
@@ -14,14 +27,65 @@ class NotesFilter(FilterSet):
         field_name='tags__name',
         to_field_name='name',
     )
+    all_tags = UserTagFilter(
+        field_name='tags__name',
+        to_field_name='name',
+        method='filter_all_tags',
+    )
+    q = CharFilter(method='search')
+    created_after = DateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = DateTimeFilter(field_name='created_at', lookup_expr='lt')
+    on_date = DateFilter(method='filter_on_date')
+    # Applied last, so it also overrides search rank ordering.
+    ordering = OrderingFilter(fields=['created_at', 'title'])
 
     class Meta:
         model = Note
         fields = [
             'title',
             'tags',
+            'all_tags',
+            'q',
+            'created_after',
+            'created_before',
+            'on_date',
+            'ordering',
         ]
 
+    def filter_on_date(self, queryset, name, value):
+        # A range on the column, unlike __date, can use its index.
+        start = make_aware(datetime.combine(value, time.min))
+        end = make_aware(datetime.combine(value + timedelta(days=1), time.min))
+        return queryset.filter(created_at__gte=start, created_at__lt=end)
+
+    def filter_all_tags(self, queryset, name, tags):
+        if not tags:
+            return queryset
+
+        NoteTag = Note.tags.through
+        note_ids = (
+            NoteTag.objects.filter(tag__in=tags)
+            .values('note')
+            .annotate(tags_count=Count('tag'))
+            .filter(tags_count=len(tags))
+            .values('note')
+        )
+        return queryset.filter(id__in=note_ids)
+
+    def search(self, queryset, name, value):
+        query = SearchQuery(
+            value, config=SEARCH_CONFIG, search_type='websearch'
+        )
+        condition = Q(search_vector=query)
+        if len(value) >= MIN_SUBSTRING_SEARCH_LENGTH:
+            condition |= Q(title__icontains=value) | Q(text__icontains=value)
+
+        return (
+            queryset.filter(condition)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', '-created_at', '-id')
+        )
+
 
 class TagsFilter(FilterSet):
     name = CharFilter(lookup_expr='icontains')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the daily note stats rollup. Run after enabling '
+        'NOTE_STATS_ROLLUP or changing TIME_ZONE, while notes are not '
+        'being written.'
+    )
+
+    def handle(self, *args, **options):
+        rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS('Note stats rebuilt.'))
@@ -0,0 +1,129 @@
+"""Prometheus metrics of API requests, database and caches.
+
+Under several worker processes, point PROMETHEUS_MULTIPROC_DIR to an
+empty directory before workers start: each process then writes its
+samples to memory-mapped files there, which ``collect_metrics()`` merges.
+"""
+
+import os
+from collections import Counter as QueryCounter
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.db import connections
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    generate_latest,
+    Histogram,
+    REGISTRY,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+
+REQUEST_LATENCY = Histogram(
+    'api_request_duration_seconds',
+    'Request latency by route.',
+    ['route', 'method'],
+)
+RESPONSES = Counter(
+    'api_responses',
+    'Responses by route and status code.',
+    ['route', 'method', 'status'],
+)
+DB_QUERIES = Histogram(
+    'api_db_queries_per_request',
+    'Database queries per request by route.',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100, float('inf')),
+)
+DB_TIME = Histogram(
+    'api_db_duration_seconds',
+    'Time spent in database queries per request by route.',
+    ['route'],
+)
+DB_CONNECTIONS = Counter(
+    'api_db_connections',
+    'Connections used by requests: new, reused persistent or pooled.',
+    ['alias', 'state'],
+)
+CACHE_REQUESTS = Counter(
+    'api_cache_requests',
+    'Cache lookups by cache and result.',
+    ['cache', 'result'],
+)
+
+
+def record_cache_lookup(cache_name: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache_name, 'hit' if hit else 'miss').inc()
+
+
+def collect_metrics() -> bytes:
+    """Render metrics of every worker process in text format."""
+    if path := os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, path=path)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+class _QueryRecorder:
+    def __init__(self, alias: str, counts: QueryCounter, times: QueryCounter):
+        self.alias = alias
+        self.counts = counts
+        self.times = times
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.times[self.alias] += perf_counter() - start
+            self.counts[self.alias] += 1
+
+
+class MetricsMiddleware:
+    """Record latency, status, queries and connection use per request.
+
+    Routes are labelled by URL name, so label values stay bounded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counts, times = QueryCounter(), QueryCounter()
+        opened = {
+            wrapper.alias: wrapper.connection for wrapper in connections.all()
+        }
+        start = perf_counter()
+        with ExitStack() as stack:
+            for wrapper in connections.all():
+                stack.enter_context(
+                    wrapper.execute_wrapper(
+                        _QueryRecorder(wrapper.alias, counts, times)
+                    )
+                )
+            response = self.get_response(request)
+        duration = perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unmatched'
+        REQUEST_LATENCY.labels(route, request.method).observe(duration)
+        RESPONSES.labels(route, request.method, response.status_code).inc()
+        DB_QUERIES.labels(route).observe(counts.total())
+        DB_TIME.labels(route).observe(sum(times.values()))
+        for alias in counts:
+            DB_CONNECTIONS.labels(
+                alias, self.connection_state(alias, opened)
+            ).inc()
+        return response
+
+    @staticmethod
+    def connection_state(alias: str, opened: dict) -> str:
+        wrapper = connections[alias]
+        if wrapper.settings_dict.get('OPTIONS', {}).get('pool'):
+            return 'pooled'
+        if opened[alias] is not None and wrapper.connection is opened[alias]:
+            return 'reused'
+        return 'new'
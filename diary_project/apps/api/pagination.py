@@ -0,0 +1,128 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
+
+# Orderings selectable by ``ordering`` param, each unique per author and
+# served by an index. Titles are unique, so they need no tiebreaker.
+NOTES_ORDERINGS = {
+    'created_at': ['created_at', 'id'],
+    '-created_at': ['-created_at', '-id'],
+    'title': ['title'],
+    '-title': ['-title'],
+}
+
+
+class NotesPagination(CursorPagination):
+    ordering = NOTES_ORDERINGS['-created_at']
+    ordering_param = 'ordering'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(
+            NOTES_ORDERINGS.get(
+                request.query_params.get(self.ordering_param),
+                NotesPagination.ordering,
+            )
+        )
+
+
+class SearchResultsPagination(LimitOffsetPagination):
+    """Offset pagination for notes ordered by search rank.
+
+    Rank is a float with many ties, so it can not serve as a cursor.
+    """
+
+    default_limit = 50
+    max_limit = 500
+
+
+class KeysetPagination:
+    """Forward-only cursor pagination for async views.
+
+    Cursor holds the sort key of the last row on the page, so every page
+    is a single range query. Ordering must be unique, e.g. end with id.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering: list[str]):
+        self.ordering = ordering
+
+    async def apaginate_queryset(self, queryset, request) -> list:
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        if cursor := request.GET.get(self.cursor_query_param):
+            try:
+                queryset = queryset.filter(self.decode_cursor(cursor))
+            except (ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        queryset = queryset.order_by(*self.ordering)
+        page = [obj async for obj in queryset[: page_size + 1]]
+
+        self.next_key = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_key = [
+                getattr(page[-1], field.lstrip('-')) for field in self.ordering
+            ]
+        return page
+
+    def get_paginated_data(self, data: list) -> dict:
+        return {'next': self.get_next_link(), 'results': data}
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> str | None:
+        if self.next_key is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_key),
+        )
+
+    def encode_cursor(self, key: list) -> str:
+        return urlsafe_b64encode(
+            json.dumps(key, default=str).encode()
+        ).decode()
+
+    def decode_cursor(self, cursor: str) -> Q:
+        """Build condition selecting rows after the encoded sort key."""
+        try:
+            key = json.loads(urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(key, list) or len(key) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = None
+        for field, value in reversed(list(zip(self.ordering, key))):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            after = Q(**{f'{name}__{lookup}': value})
+            condition = (
+                after
+                if condition is None
+                else after | Q(**{name: value}) & condition
+            )
+        return condition
@@ -1,9 +1,10 @@
+from django.conf import settings
 from rest_framework.permissions import IsAuthenticated
 
 
 class IsAuthor(IsAuthenticated):
     def has_object_permission(self, request, view, obj) -> bool:
-        return obj.author == request.user
+        return obj.author_id == request.user.id
 
 
 class IsStaff(IsAuthenticated):
@@ -12,3 +13,11 @@ class IsStaff(IsAuthenticated):
 
     def has_object_permission(self, request, view, obj) -> bool:
         return self.has_permission(request, view)
+
+
+class IsStaffOrAllowedIP(IsStaff):
+    def has_permission(self, request, view) -> bool:
+        remote_addr = request.META.get('REMOTE_ADDR')
+        return remote_addr in settings.METRICS_ALLOWED_IPS or (
+            super().has_permission(request, view)
+        )
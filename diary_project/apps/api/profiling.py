@@ -0,0 +1,234 @@
+"""Opt-in per-request profiling of queries, serialization and rendering.
+
+Enabled by the API_PROFILING setting, which installs
+``ProfilingMiddleware``. While it is off, the only cost left is a context
+variable lookup per serializer ``data`` access.
+"""
+
+import json
+import logging
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager, ExitStack
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of request duration buckets in milliseconds.
+DURATION_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+MAX_FINGERPRINT_LENGTH = 200
+_PLACEHOLDERS = re.compile(r'%s(?:, %s)*')
+
+_profile: ContextVar['RequestProfile | None'] = ContextVar(
+    'profile', default=None
+)
+
+
+def fingerprint(sql: str) -> str:
+    """Get SQL with placeholder lists collapsed, so N+1 queries match."""
+    return _PLACEHOLDERS.sub('%s', sql)[:MAX_FINGERPRINT_LENGTH]
+
+
+class RequestProfile:
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.sections = defaultdict(float)
+        self._open_sections = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Record query, as a database execute wrapper."""
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.query_count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @contextmanager
+    def section(self, name: str):
+        # Nested sections of the same name are timed once.
+        if name in self._open_sections:
+            yield
+            return
+        self._open_sections.add(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] += perf_counter() - start
+            self._open_sections.discard(name)
+
+    def duplicates(self) -> dict[str, int]:
+        return {
+            sql: count for sql, count in self.fingerprints.items() if count > 1
+        }
+
+
+@contextmanager
+def profile_section(name: str):
+    """Time block as part of the current request profile, if any."""
+    if (profile := _profile.get()) is None:
+        yield
+    else:
+        with profile.section(name):
+            yield
+
+
+class ProfiledSerializerMixin:
+    """Count time spent building serializer data as ``serializer``."""
+
+    @property
+    def data(self):
+        with profile_section('serializer'):
+            return super().data
+
+
+class ProfileHistogram:
+    """In-process aggregate of request profiles by route."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes = {}
+
+    def add(self, route: str, total: float, profile: RequestProfile):
+        bucket = bisect_left(DURATION_BUCKETS, total * 1000)
+        with self._lock:
+            stats = self._routes.setdefault(
+                route,
+                {
+                    'count': 0,
+                    'buckets': [0] * len(DURATION_BUCKETS),
+                    'total_time': 0.0,
+                    'db_time': 0.0,
+                    'serializer_time': 0.0,
+                    'render_time': 0.0,
+                    'queries': 0,
+                    'duplicate_queries': Counter(),
+                },
+            )
+            stats['count'] += 1
+            stats['buckets'][bucket] += 1
+            stats['total_time'] += total
+            stats['db_time'] += profile.db_time
+            stats['serializer_time'] += profile.sections['serializer']
+            stats['render_time'] += profile.sections['render']
+            stats['queries'] += profile.query_count
+            stats['duplicate_queries'].update(profile.duplicates())
+
+    def snapshot(self) -> dict:
+        """Get routes with average times in milliseconds."""
+        with self._lock:
+            return {
+                route: {
+                    'count': stats['count'],
+                    'histogram': {
+                        str(bound): count
+                        for bound, count in zip(
+                            DURATION_BUCKETS, stats['buckets']
+                        )
+                    },
+                    **{
+                        f'avg_{name}_ms': round(
+                            stats[f'{name}_time'] / stats['count'] * 1000, 3
+                        )
+                        for name in ('total', 'db', 'serializer', 'render')
+                    },
+                    'avg_queries': stats['queries'] / stats['count'],
+                    'duplicate_queries': dict(
+                        stats['duplicate_queries'].most_common()
+                    ),
+                }
+                for route, stats in self._routes.items()
+            }
+
+
+PROFILE_HISTOGRAM = ProfileHistogram()
+
+
+class ProfilingMiddleware:
+    """Profile requests into Server-Timing header, log and histogram.
+
+    Queries of every database alias are recorded. Serializer time
+    includes queries the serializer makes, e.g. for related objects.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        total = perf_counter() - start
+
+        route = self.get_route(request)
+        PROFILE_HISTOGRAM.add(route, total, profile)
+        response['Server-Timing'] = self.get_server_timing(total, profile)
+        logger.info(
+            json.dumps(
+                {
+                    'route': route,
+                    'status': response.status_code,
+                    'total_ms': round(total * 1000, 3),
+                    'db_ms': round(profile.db_time * 1000, 3),
+                    'serializer_ms': round(
+                        profile.sections['serializer'] * 1000, 3
+                    ),
+                    'render_ms': round(profile.sections['render'] * 1000, 3),
+                    'queries': profile.query_count,
+                    'duplicate_queries': profile.duplicates(),
+                }
+            )
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook.
+        if (profile := _profile.get()) is not None:
+            section = profile.section('render')
+            section.__enter__()
+
+            def end_section(response):
+                # Callbacks returning a value replace the response.
+                section.__exit__(None, None, None)
+
+            response.add_post_render_callback(end_section)
+        return response
+
+    @staticmethod
+    def get_route(request) -> str:
+        match = getattr(request, 'resolver_match', None)
+        return f'{request.method} {match.view_name if match else "unknown"}'
+
+    @staticmethod
+    def get_server_timing(total: float, profile: RequestProfile) -> str:
+        return ', '.join(
+            [
+                f'db;dur={profile.db_time * 1000:.3f};'
+                f'desc="{profile.query_count} queries"',
+                *(
+                    f'{name};dur={duration * 1000:.3f}'
+                    for name, duration in profile.sections.items()
+                ),
+                f'total;dur={total * 1000:.3f}',
+            ]
+        )
@@ -0,0 +1,66 @@
+from contextvars import ContextVar
+from random import choice
+from time import time_ns
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import get_user_cache_version
+
+_read_database: ContextVar[str | None] = ContextVar(
+    'read_database', default=None
+)
+
+
+def wrote_recently(user_id) -> bool:
+    """Check if user changed their data within the read-your-writes window.
+
+    Relies on the user cache version, which signals bump on every write.
+    """
+    window = settings.REPLICA_READ_YOUR_WRITES_WINDOW * 10**9
+    return time_ns() - get_user_cache_version(user_id) < window
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen for the current request.
+
+    Outside of ReplicaReadMixin requests every query uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaReadMixin:
+    """Serve safe requests from a random replica.
+
+    Users who wrote recently keep reading from the primary, so they
+    always see their own changes despite replication lag.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not wrote_recently(request.user.id)
+        ):
+            self._read_database_token = _read_database.set(
+                choice(settings.DATABASE_REPLICAS)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if token := getattr(self, '_read_database_token', None):
+            _read_database.reset(token)
+            del self._read_database_token
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,14 +1,39 @@
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
 from rest_framework.serializers import (
+    IntegerField,
     ListField,
     ModelSerializer,
+    Serializer,
     SlugField,
     ValidationError,
 )
 
+from diary.constants import MAX_TITLE_LENGTH
 from diary.models import Note, Tag
 
+from .profiling import ProfiledSerializerMixin
+from .values import ValuesSerializerMixin
+
+
+@contextmanager
+def unique_violation_as_error(message: str):
+    """Turn unique constraint violation inside block into 400 response.
 
-class TagSerializer(ModelSerializer):
+    Block runs in a savepoint, so duplicates cost no extra query.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError:
+        raise ValidationError(message)
+
+
+class TagSerializer(
+    ProfiledSerializerMixin, ValuesSerializerMixin, ModelSerializer
+):
     class Meta:
         model = Tag
         fields = [
@@ -16,15 +41,37 @@ class TagSerializer(ModelSerializer):
             'name',
         ]
 
-    def validate(self, attrs):
-        if Tag.objects.filter(
-            author=self.context['request'].user, name=attrs['name']
+    def to_representation(self, instance):
+        repr = super().to_representation(instance)
+        repr['notes_count'] = getattr(instance, 'notes_count', 0)
+        return repr
+
+    def get_values_fields(self) -> list[str]:
+        return [*super().get_values_fields(), 'notes_count']
+
+    def represent_values(self, rows) -> list[dict]:
+        rows = list(rows)
+        data = super().represent_values(rows)
+        for item, row in zip(data, rows):
+            item['notes_count'] = row['notes_count']
+        return data
+
+    def create(self, validated_data):
+        with unique_violation_as_error(
+            f'Tag with name {validated_data["name"]} exists!'
         ):
-            raise ValidationError(f'Tag with name {attrs["name"]} exists!')
-        return attrs
+            return super().create(validated_data)
+
+    def update(self, instance: Tag, validated_data):
+        with unique_violation_as_error(
+            f'Tag with name {validated_data.get("name")} exists!'
+        ):
+            return super().update(instance, validated_data)
 
 
-class NoteSerializer(ModelSerializer):
+class NoteSerializer(
+    ProfiledSerializerMixin, ValuesSerializerMixin, ModelSerializer
+):
     tags = ListField(
         child=SlugField(),
         write_only=True,
@@ -38,44 +85,101 @@ class NoteSerializer(ModelSerializer):
             'title',
             'text',
             'tags',
+            'version',
         ]
+        read_only_fields = ['version']
 
-    def validate(self, attrs):
-        if Note.objects.filter(
-            author=self.context['request'].user, title=attrs['title']
-        ):
-            raise ValidationError(f'Note with title {attrs["title"]} exists!')
-        return attrs
+    def __init__(self, *args, fields=None, **kwargs):
+        """Optionally limit represented fields to the given names."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def to_representation(self, instance):
         repr = super().to_representation(instance)
-        repr['tags'] = [tag.name for tag in instance.tags.all()]
+        if 'tags' in self.fields:
+            repr['tags'] = [tag.name for tag in instance.tags.all()]
         return repr
 
+    def get_values_fields(self) -> list[str]:
+        return list(dict.fromkeys(['id', *super().get_values_fields()]))
+
+    def represent_values(self, rows) -> list[dict]:
+        rows = list(rows)
+        data = super().represent_values(rows)
+        if rows and 'tags' in self.fields:
+            note_tags = defaultdict(list)
+            for note_id, name in Tag.objects.filter(
+                notes__in=[row['id'] for row in rows]
+            ).values_list('notes', 'name'):
+                note_tags[note_id].append(name)
+            for item, row in zip(data, rows):
+                item['tags'] = note_tags[row['id']]
+        return data
+
     def create(self, validated_data):
         tags = validated_data.pop('tags')
 
         author = validated_data['author'] = self.context['request'].user
-        note = super().create(validated_data)
-
-        tags_list = [
-            Tag.objects.get_or_create(name=tag, author=author)[0]
-            for tag in tags
-        ]
-        note.tags.set(tags_list)
+        with unique_violation_as_error(
+            f'Note with title {validated_data["title"]} exists!'
+        ):
+            note = super().create(validated_data)
+        note.tags.set(Tag.objects.get_or_create_many(author, tags))
 
         return note
 
     def update(self, instance: Note, validated_data):
-        tags = validated_data.pop('tags')
+        # Partial updates keep tags unless given.
+        tags = validated_data.pop('tags', None)
 
-        super().update(instance, validated_data)
+        with unique_violation_as_error(
+            f'Note with title {validated_data.get("title")} exists!'
+        ):
+            super().update(instance, validated_data)
 
-        author = self.context['request'].user
-        tags_list = [
-            Tag.objects.get_or_create(name=tag, author=author)[0]
-            for tag in tags
-        ]
-        instance.tags.set(tags_list)
+        if tags is not None:
+            author = self.context['request'].user
+            instance.tags.set(Tag.objects.get_or_create_many(author, tags))
 
         return instance
+
+
+class NoteImportSerializer(ModelSerializer):
+    tags = ListField(
+        child=SlugField(max_length=MAX_TITLE_LENGTH),
+        default=list,
+    )
+
+    class Meta:
+        model = Note
+        fields = [
+            'title',
+            'text',
+            'tags',
+        ]
+
+
+class NotesBatchSerializer(Serializer):
+    ids = ListField(child=IntegerField(), required=False)
+
+
+class NotesRetagSerializer(NotesBatchSerializer):
+    add = ListField(
+        child=SlugField(max_length=MAX_TITLE_LENGTH),
+        default=list,
+    )
+    remove = ListField(
+        child=SlugField(max_length=MAX_TITLE_LENGTH),
+        default=list,
+    )
+
+    def validate(self, attrs):
+        if not attrs['add'] and not attrs['remove']:
+            raise ValidationError('Provide tags to add or remove.')
+        if both := set(attrs['add']) & set(attrs['remove']):
+            raise ValidationError(
+                f'Tags both added and removed: {", ".join(sorted(both))}.'
+            )
+        return attrs
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils.timezone import now
+from rest_framework.authtoken.models import Token
+
+from diary.models import Note, Tag
+
+from .authentication import invalidate_cached_tokens
+from .cache import invalidate_user_cache
+from .stats import add_to_daily_stats, update_daily_text_length
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=Tag)
+def invalidate_author_cache(sender, instance, **kwargs):
+    invalidate_user_cache(instance.author_id)
+
+
+@receiver(m2m_changed, sender=Note.tags.through)
+def invalidate_note_tags_cache(sender, instance, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate_user_cache(instance.author_id)
+
+
+@receiver(post_save, sender=Note)
+def add_created_note_stats(sender, instance, created, **kwargs):
+    if created:
+        add_to_daily_stats([instance])
+
+
+@receiver(pre_save, sender=Note)
+def update_note_text_stats(sender, instance, update_fields, **kwargs):
+    if not instance._state.adding and (
+        update_fields is None or 'text' in update_fields
+    ):
+        update_daily_text_length(instance)
+
+
+@receiver(pre_delete, sender=Note)
+def subtract_deleted_note_stats(sender, instance, origin, **kwargs):
+    # Stats of deleted users are deleted along with them.
+    if not isinstance(origin, User):
+        add_to_daily_stats([instance], sign=-1)
+
+
+@receiver(post_save, sender=Tag)
+def touch_renamed_tag_notes(sender, instance, created, **kwargs):
+    # Notes show tag names, so synced clients must refetch them.
+    if not created:
+        Note.objects.filter(tags=instance).update(updated_at=now())
+
+
+@receiver(pre_delete, sender=Tag)
+def touch_deleted_tag_notes(sender, instance, origin, **kwargs):
+    if not isinstance(origin, User):
+        Note.objects.filter(tags=instance).update(updated_at=now())
+
+
+@receiver(user_logged_out)
+def invalidate_logged_out_token(sender, request, user, **kwargs):
+    # Receiving post_delete would stop djoser's token delete being fast.
+    if isinstance(request.auth, Token):
+        invalidate_cached_tokens([request.auth.key])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, update_fields, **kwargs):
+    # Login only touches last_login, which cached users may keep stale.
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    invalidate_cached_tokens(
+        Token.objects.filter(user=instance).values_list('key', flat=True)
+    )
+
+
+@receiver(pre_delete, sender=User)
+def invalidate_deleted_user_tokens(sender, instance, **kwargs):
+    invalidate_cached_tokens(
+        Token.objects.filter(user=instance).values_list('key', flat=True)
+    )
@@ -0,0 +1,157 @@
+from collections import defaultdict
+from datetime import tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (
+    Count,
+    DateField,
+    F,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import (
+    Length,
+    TruncDate,
+    TruncMonth,
+    TruncWeek,
+)
+from django.utils.timezone import get_default_timezone, localtime
+from rest_framework.exceptions import ValidationError
+
+from diary.models import Note, NoteDailyStats, Tag
+
+STATS_PERIODS = {
+    'day': TruncDate,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def parse_time_zone(name: str) -> tzinfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError({'tz': ['Unknown time zone.']})
+
+
+def get_note_stats(user, period: str, tz: tzinfo) -> dict:
+    """Count user's notes per period in the time zone, per tag and overall.
+
+    Reads the daily rollup when it is enabled and kept in the same zone.
+    """
+    if period not in STATS_PERIODS:
+        raise ValidationError(
+            {'period': [f'Choose one of: {", ".join(STATS_PERIODS)}.']}
+        )
+    trunc = STATS_PERIODS[period]
+
+    if settings.NOTE_STATS_ROLLUP and str(tz) == settings.TIME_ZONE:
+        rows = NoteDailyStats.objects.filter(author=user)
+        period_start = F('date') if period == 'day' else trunc('date')
+        notes_count = Sum('notes_count', default=0)
+        text_length = Sum('text_length', default=0)
+    else:
+        rows = Note.objects.filter(author=user)
+        period_start = trunc('created_at', output_field=DateField(), tzinfo=tz)
+        notes_count = Count('id')
+        text_length = Sum(Length('text'), default=0)
+
+    totals = rows.aggregate(notes_count=notes_count, text_length=text_length)
+    timeline = (
+        rows.annotate(period=period_start)
+        .values('period')
+        .annotate(count=notes_count)
+        .filter(count__gt=0)
+        .order_by('period')
+    )
+    tags = (
+        Tag.objects.filter(author=user)
+        .annotate(count=Count('notes'))
+        .filter(count__gt=0)
+        .order_by('-count', 'name')
+        .values('name', 'count')
+    )
+    return {
+        'period': period,
+        'tz': str(tz),
+        **totals,
+        'timeline': list(timeline),
+        'tags': list(tags),
+    }
+
+
+def _rollup_date(created_at):
+    return localtime(created_at, get_default_timezone()).date()
+
+
+def add_to_daily_stats(notes, sign: int = 1) -> None:
+    """Add created notes to the daily rollup, or subtract deleted ones.
+
+    Concurrent writers increment rows in place, so no change is lost.
+    """
+    if not settings.NOTE_STATS_ROLLUP:
+        return
+
+    deltas = defaultdict(lambda: [0, 0])
+    for note in notes:
+        delta = deltas[note.author_id, _rollup_date(note.created_at)]
+        delta[0] += sign
+        delta[1] += sign * len(note.text)
+    if not deltas:
+        return
+
+    table = connection.ops.quote_name(NoteDailyStats._meta.db_table)
+    rows = ', '.join(['(%s, %s, %s, %s)'] * len(deltas))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} '
+            '(author_id, date, notes_count, text_length) '
+            f'VALUES {rows} '
+            'ON CONFLICT (author_id, date) DO UPDATE SET '
+            f'notes_count = {table}.notes_count + EXCLUDED.notes_count, '
+            f'text_length = {table}.text_length + EXCLUDED.text_length',
+            [
+                value
+                for (author_id, date), delta in deltas.items()
+                for value in (author_id, date, *delta)
+            ],
+        )
+
+
+def update_daily_text_length(note) -> None:
+    """Apply change of saved note's text length to the daily rollup.
+
+    Must run before the note is saved, as the old length is read from it.
+    """
+    if not settings.NOTE_STATS_ROLLUP:
+        return
+
+    NoteDailyStats.objects.filter(
+        author_id=note.author_id, date=_rollup_date(note.created_at)
+    ).update(
+        text_length=F('text_length')
+        + len(note.text)
+        - Subquery(
+            Note.objects.filter(pk=note.pk)
+            .annotate(length=Length('text'))
+            .values('length')
+        )
+    )
+
+
+def rebuild_daily_stats() -> None:
+    """Recompute the daily rollup from notes."""
+    tz = get_default_timezone()
+    with transaction.atomic():
+        NoteDailyStats.objects.all().delete()
+        NoteDailyStats.objects.bulk_create(
+            NoteDailyStats(**row)
+            for row in Note.objects.annotate(
+                date=TruncDate('created_at', tzinfo=tz)
+            )
+            .values('author_id', 'date')
+            .annotate(notes_count=Count('id'), text_length=Sum(Length('text')))
+            .order_by()
+        )
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, UTC
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+
+from diary.models import DeletedRecord, Note, Tag
+
+from .serializers import NoteSerializer, TagSerializer
+
+User = get_user_model()
+
+# Changes are looked up a bit before the token time, so writes committed
+# after the previous sync but stamped before it are not missed. Clients
+# may receive a few objects twice, which is harmless.
+SYNC_TOKEN_OVERLAP = timedelta(seconds=5)
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def make_sync_token(moment: datetime) -> str:
+    return str((moment - _EPOCH) // timedelta(microseconds=1))
+
+
+def parse_sync_token(token: str) -> datetime:
+    try:
+        return _EPOCH + timedelta(microseconds=int(token))
+    except (ValueError, OverflowError):
+        raise ValidationError({'since': ['Invalid sync token.']})
+
+
+def has_changes(user, since: datetime) -> bool:
+    """Check for user's changes after the moment in one indexed query."""
+    changed = (
+        Exists(
+            Note.objects.filter(author=OuterRef('pk'), updated_at__gte=since)
+        )
+        | Exists(
+            Tag.objects.filter(author=OuterRef('pk'), updated_at__gte=since)
+        )
+        | Exists(
+            DeletedRecord.objects.filter(
+                author=OuterRef('pk'), deleted_at__gte=since
+            )
+        )
+    )
+    return User.objects.filter(changed, pk=user.pk).exists()
+
+
+def get_changes(user, since: datetime | None) -> dict:
+    """Get user's notes and tags changed after the moment.
+
+    Without the moment every note and tag is returned.
+    """
+    notes = Note.objects.filter(author=user)
+    tags = Tag.objects.filter(author=user)
+    deleted = {'notes': [], 'tags': []}
+
+    if since is not None:
+        notes = notes.filter(updated_at__gte=since)
+        tags = tags.filter(updated_at__gte=since)
+        for model_name, object_id in DeletedRecord.objects.filter(
+            author=user, deleted_at__gte=since
+        ).values_list('model_name', 'object_id'):
+            deleted[f'{model_name}s'].append(object_id)
+
+    note_serializer = NoteSerializer()
+    tag_serializer = TagSerializer()
+    return {
+        'notes': note_serializer.represent_values(
+            notes.order_by('id').values(*note_serializer.get_values_fields())
+        ),
+        'tags': tag_serializer.represent_values(
+            tags.annotate(notes_count=Count('notes'))
+            .order_by('id')
+            .values(*tag_serializer.get_values_fields())
+        ),
+        'deleted': deleted,
+    }
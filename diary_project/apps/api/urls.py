@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import async_views, views
 
 app_name = 'api'
 
@@ -9,8 +9,34 @@ router = DefaultRouter()
 router.register('notes', views.NotesView, basename='notes')
 router.register('tags', views.TagsView, basename='tags')
 
+async_urlpatterns = [
+    path(
+        'notes/',
+        async_views.AsyncNotesListView.as_view(),
+        name='async-notes-list',
+    ),
+    path(
+        'notes/<int:pk>/',
+        async_views.AsyncNotesDetailView.as_view(),
+        name='async-notes-detail',
+    ),
+    path(
+        'tags/',
+        async_views.AsyncTagsListView.as_view(),
+        name='async-tags-list',
+    ),
+    path(
+        'tags/<int:pk>/',
+        async_views.AsyncTagsDetailView.as_view(),
+        name='async-tags-detail',
+    ),
+]
+
 urlpatterns = [
     path('auth/', include('djoser.urls')),
     path('auth/', include('djoser.urls.authtoken')),
+    path('async/', include(async_urlpatterns)),
+    path('sync/', views.SyncView.as_view(), name='sync'),
+    path('profiling/', views.ProfilingView.as_view(), name='profiling'),
     path('', include(router.urls)),
 ]
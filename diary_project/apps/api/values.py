@@ -0,0 +1,58 @@
+from rest_framework.response import Response
+
+from .profiling import profile_section
+
+
+class ValuesSerializerMixin:
+    """Represent ``.values()`` rows without building model instances.
+
+    Output matches to_representation() of instances as long as readable
+    fields map straight to columns or annotations of the queryset.
+    """
+
+    def get_values_fields(self) -> list[str]:
+        """Get names to pass to ``.values()``."""
+        return [field.source for field in self._readable_fields]
+
+    def represent_values(self, rows) -> list[dict]:
+        fields = [
+            (field.field_name, field.source, field.to_representation)
+            for field in self._readable_fields
+        ]
+        return [
+            {
+                name: None if row[source] is None else represent(row[source])
+                for name, source, represent in fields
+            }
+            for row in rows
+        ]
+
+
+class ValuesListMixin:
+    """List objects through serializer's fast ``.values()`` read path."""
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        if hasattr(self.paginator, 'get_ordering'):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+        else:
+            ordering = []
+        queryset = queryset.prefetch_related(None).values(
+            *dict.fromkeys(
+                [
+                    *serializer.get_values_fields(),
+                    # Cursor pagination reads position from rows.
+                    *(field.lstrip('-') for field in ordering),
+                ]
+            )
+        )
+
+        page = self.paginate_queryset(queryset)
+        with profile_section('serializer'):
+            data = serializer.represent_values(
+                queryset if page is None else page
+            )
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
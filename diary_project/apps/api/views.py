@@ -1,31 +1,288 @@
+from functools import cached_property
+
+from django.conf import settings
+from django.db.models import Count, Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.timezone import now
 from django_filters.rest_framework import DjangoFilterBackend
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
 from diary.models import Note, Tag
 
+from .bulk import (
+    delete_notes,
+    import_notes,
+    iter_json_array,
+    iter_ndjson,
+    retag_notes,
+)
+from .cache import CachedListMixin, ConditionalGetMixin
+from .concurrency import OptimisticUpdateMixin
+from .export import EXPORT_CHUNK_SIZE, EXPORT_RENDERERS
 from .filters import NotesFilter, TagsFilter
-from .permissions import IsAuthor
-from .serializers import NoteSerializer, TagSerializer
+from .metrics import collect_metrics
+from .pagination import NotesPagination, SearchResultsPagination
+from .permissions import IsAuthor, IsStaff, IsStaffOrAllowedIP
+from .profiling import PROFILE_HISTOGRAM
+from .routers import ReplicaReadMixin
+from .serializers import (
+    NotesBatchSerializer,
+    NoteSerializer,
+    NotesRetagSerializer,
+    TagSerializer,
+)
+from .stats import get_note_stats, parse_time_zone
+from .sync import (
+    get_changes,
+    has_changes,
+    make_sync_token,
+    parse_sync_token,
+    SYNC_TOKEN_OVERLAP,
+)
+from .values import ValuesListMixin
+
+TAG_CLOUD_SIZE = 50
+MAX_TAG_CLOUD_SIZE = 500
+SPARSE_FIELDSETS_ACTIONS = ('list', 'retrieve')
 
 
-class NotesView(ModelViewSet):
+class NotesView(
+    ReplicaReadMixin,
+    OptimisticUpdateMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    ValuesListMixin,
+    ModelViewSet,
+):
     serializer_class = NoteSerializer
     permission_classes = [IsAuthor]
     filter_backends = [DjangoFilterBackend]
     filterset_class = NotesFilter
+    pagination_class = NotesPagination
+
+    @property
+    def paginator(self):
+        if self.request.query_params.get('q') and not hasattr(
+            self, '_paginator'
+        ):
+            self._paginator = SearchResultsPagination()
+        return super().paginator
+
+    @cached_property
+    def requested_fields(self) -> set[str] | None:
+        """Get note fields selected by ``fields`` and ``omit`` params.
+
+        None means all fields.
+        """
+        params = self.request.query_params
+        if self.action not in SPARSE_FIELDSETS_ACTIONS or not (
+            'fields' in params or 'omit' in params
+        ):
+            return None
+
+        all_fields = set(NoteSerializer.Meta.fields)
+        errors = {}
+        selected = {}
+        for param in ('fields', 'omit'):
+            names = set(filter(None, params.get(param, '').split(',')))
+            if unknown := names - all_fields:
+                errors[param] = [
+                    f'Unknown fields: {", ".join(sorted(unknown))}.'
+                ]
+            selected[param] = names
+        if errors:
+            raise ValidationError(errors)
+
+        return (selected['fields'] or all_fields) - selected['omit']
 
     def get_queryset(self):
-        return Note.objects.filter(author=self.request.user)
+        queryset = Note.objects.filter(author=self.request.user)
+        if (fields := self.requested_fields) is None:
+            fields = set(NoteSerializer.Meta.fields)
+        else:
+            queryset = queryset.defer(*{'title', 'text'} - fields)
+
+        if 'tags' in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.only('name'))
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.requested_fields is not None:
+            kwargs['fields'] = self.requested_fields
+        return super().get_serializer(*args, **kwargs)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        if request.content_type.startswith('application/x-ndjson'):
+            rows = iter_ndjson(request.stream)
+        else:
+            rows = iter_json_array(request.stream)
+        return Response(import_notes(request.user, rows))
+
+    def get_batch_queryset(self, data: dict):
+        """Get notes selected by ``ids`` in body and filter params."""
+        notes = self.filter_queryset(self.get_queryset())
+        if 'ids' in data:
+            return notes.filter(id__in=data['ids'])
+        selecting_filters = set(NotesFilter.base_filters) - {'ordering'}
+        if not set(self.request.query_params) & selecting_filters:
+            raise ValidationError(
+                {'ids': ['Provide note ids or filter parameters.']}
+            )
+        return notes
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        serializer = NotesBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        notes = self.get_batch_queryset(serializer.validated_data)
+        return Response({'deleted': delete_notes(request.user, notes)})
+
+    @action(detail=False, methods=['post'])
+    def bulk_tags(self, request):
+        serializer = NotesRetagSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        notes = self.get_batch_queryset(serializer.validated_data)
+        updated = retag_notes(
+            request.user,
+            notes,
+            add=serializer.validated_data['add'],
+            remove=serializer.validated_data['remove'],
+        )
+        return Response({'updated': updated})
+
+    @action(detail=False)
+    def stats(self, request):
+        params = request.query_params
+        return Response(
+            get_note_stats(
+                request.user,
+                period=params.get('period', 'day'),
+                tz=parse_time_zone(params.get('tz', settings.TIME_ZONE)),
+            )
+        )
+
+    @action(detail=False)
+    def export(self, request):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_RENDERERS:
+            raise ValidationError(
+                {
+                    'export_format': [
+                        f'Choose one of: {", ".join(EXPORT_RENDERERS)}.'
+                    ]
+                }
+            )
+        content_type, render = EXPORT_RENDERERS[export_format]
 
+        notes = self.filter_queryset(self.get_queryset()).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+        response = StreamingHttpResponse(
+            render(self.get_serializer(note).data for note in notes),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="diary.{export_format}"'
+        )
+        return response
 
-class TagsView(ModelViewSet):
+
+class TagsView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    ValuesListMixin,
+    ModelViewSet,
+):
     serializer_class = TagSerializer
     permission_classes = [IsAuthor]
     filter_backends = [DjangoFilterBackend]
     filterset_class = TagsFilter
 
     def get_queryset(self):
-        return Tag.objects.filter(author=self.request.user)
+        return (
+            Tag.objects.filter(author=self.request.user)
+            .annotate(notes_count=Count('notes'))
+            .order_by('name')
+        )
+
+    @action(detail=False)
+    def cloud(self, request):
+        try:
+            limit = min(
+                int(request.query_params.get('limit', TAG_CLOUD_SIZE)),
+                MAX_TAG_CLOUD_SIZE,
+            )
+        except ValueError:
+            raise ValidationError({'limit': ['A valid integer is required.']})
+
+        tags = (
+            self.get_queryset()
+            .filter(notes_count__gt=0)
+            .order_by('-notes_count', 'name')
+            .values('name', 'notes_count')[:limit]
+        )
+        return Response(tags)
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
+
+
+class SyncView(APIView):
+    """Return user's notes and tags changed since the ``since`` token.
+
+    The first sync, without the token, returns everything. Reads always
+    use the primary, as replica lag could make clients skip changes.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        token = make_sync_token(now())
+        if (since := request.query_params.get('since')) is None:
+            return Response(
+                {'token': token, **get_changes(request.user, None)}
+            )
+
+        since = parse_sync_token(since) - SYNC_TOKEN_OVERLAP
+        if not has_changes(request.user, since):
+            return Response(
+                {
+                    'token': token,
+                    'notes': [],
+                    'tags': [],
+                    'deleted': {'notes': [], 'tags': []},
+                }
+            )
+        return Response({'token': token, **get_changes(request.user, since)})
+
+
+class ProfilingView(APIView):
+    """Show request profiles aggregated by ProfilingMiddleware."""
+
+    permission_classes = [IsStaff]
+
+    def get(self, request):
+        return Response(PROFILE_HISTOGRAM.snapshot())
+
+
+class MetricsView(APIView):
+    """Expose metrics in Prometheus text format."""
+
+    permission_classes = [IsStaffOrAllowedIP]
+
+    def get(self, request):
+        return HttpResponse(
+            collect_metrics(), content_type=CONTENT_TYPE_LATEST
+        )
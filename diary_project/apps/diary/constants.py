@@ -1 +1,8 @@
 MAX_TITLE_LENGTH = 100
+MAX_MODEL_NAME_LENGTH = 20
+
+# Full-text search stems words with the english dictionary, so "mountain"
+# finds "mountains". Shorter queries skip the trigram substring fallback,
+# as trigram indexes cannot serve them.
+SEARCH_CONFIG = 'english'
+MIN_SUBSTRING_SEARCH_LENGTH = 3
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0003_alter_note_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='note_author_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0006_note_tag_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX "note_tags_tag_note_idx" ON "diary_note_tags" ("tag_id", "note_id");',
+            reverse_sql='DROP INDEX "note_tags_tag_note_idx";',
+        ),
+    ]
@@ -1,24 +1,129 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import transaction
 from django.db.models import (
+    BigIntegerField,
     CASCADE,
     CharField,
+    DateField,
     DateTimeField,
     ForeignKey,
+    GeneratedField,
+    Index,
+    IntegerField,
+    Manager,
     ManyToManyField,
     Model,
+    PositiveBigIntegerField,
+    PositiveIntegerField,
+    QuerySet,
     SlugField,
     TextField,
     UniqueConstraint,
 )
+from django.db.models.functions import Upper
 
-from diary.constants import MAX_TITLE_LENGTH
+from diary.constants import (
+    MAX_MODEL_NAME_LENGTH,
+    MAX_TITLE_LENGTH,
+    SEARCH_CONFIG,
+)
 
 User = get_user_model()
 
 
-class Tag(Model):
+class VersionConflict(Exception):
+    """Saved object was changed or deleted since it was read."""
+
+
+class TombstoneQuerySet(QuerySet):
+    """Log deleted objects for incremental sync."""
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            DeletedRecord.objects.bulk_create(
+                DeletedRecord(
+                    author_id=author_id,
+                    model_name=self.model._meta.model_name,
+                    object_id=pk,
+                )
+                for pk, author_id in self.values_list('pk', 'author_id')
+            )
+            return super().delete()
+
+
+class TombstoneModel(Model):
+    """Model with author, logging its deletions as DeletedRecord."""
+
+    class Meta:
+        abstract = True
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            DeletedRecord.objects.create(
+                author_id=self.author_id,
+                model_name=self._meta.model_name,
+                object_id=self.pk,
+            )
+            return super().delete(*args, **kwargs)
+
+
+class TagManager(Manager.from_queryset(TombstoneQuerySet)):
+    def get_or_create_many(self, author, names) -> list['Tag']:
+        """Get author's tags by names, creating the missing ones in bulk.
+
+        Conflicting inserts from concurrent requests are ignored, so the
+        final read always returns every requested tag.
+        """
+        names = set(names)
+        tags = list(self.filter(author=author, name__in=names))
+
+        if missing_names := names - {tag.name for tag in tags}:
+            self.bulk_create(
+                [
+                    self.model(author=author, name=name)
+                    for name in missing_names
+                ],
+                ignore_conflicts=True,
+            )
+            tags = list(self.filter(author=author, name__in=names))
+
+        return tags
+
+    async def aget_or_create_many(self, author, names) -> list['Tag']:
+        """Async version of get_or_create_many()."""
+        names = set(names)
+        tags = [
+            tag async for tag in self.filter(author=author, name__in=names)
+        ]
+
+        if missing_names := names - {tag.name for tag in tags}:
+            await self.abulk_create(
+                [
+                    self.model(author=author, name=name)
+                    for name in missing_names
+                ],
+                ignore_conflicts=True,
+            )
+            tags = [
+                tag async for tag in self.filter(author=author, name__in=names)
+            ]
+
+        return tags
+
+
+class NoteManager(Manager.from_queryset(TombstoneQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
+class Tag(TombstoneModel):
     author = ForeignKey(User, on_delete=CASCADE)
     name = SlugField(max_length=MAX_TITLE_LENGTH)
+    updated_at = DateTimeField(auto_now=True)
+
+    objects = TagManager()
 
     def __str__(self) -> str:
         return self.name
@@ -31,10 +136,17 @@ class Tag(Model):
                 fields=['author', 'name'],
             ),
         ]
+        indexes = [
+            Index(
+                name='tag_author_updated_at_idx',
+                fields=['author', 'updated_at'],
+            ),
+        ]
 
 
-class Note(Model):
+class Note(TombstoneModel):
     created_at = DateTimeField(auto_now_add=True)
+    updated_at = DateTimeField(auto_now=True)
     author = ForeignKey(User, on_delete=CASCADE)
 
     title = CharField(max_length=MAX_TITLE_LENGTH)
@@ -42,9 +154,60 @@ class Note(Model):
 
     tags = ManyToManyField(Tag, related_name='notes')
 
+    # Bumped by every save, which fails if another one came first.
+    version = PositiveIntegerField(default=1)
+
+    search_vector = GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('text', weight='B', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = NoteManager()
+
     def __str__(self) -> str:
         return self.title
 
+    def _do_update(
+        self, base_qs, using, pk_val, values, update_fields, forced_update
+    ):
+        """Update the row only if it still has the version of the instance.
+
+        The check and the version bump are part of the same UPDATE, so no
+        row lock is needed. Raises VersionConflict if no row matched.
+        """
+        version_field = self._meta.get_field('version')
+        if not any(field is version_field for field, _, _ in values):
+            return super()._do_update(
+                base_qs, using, pk_val, values, update_fields, forced_update
+            )
+
+        values = [
+            (
+                field,
+                model,
+                self.version + 1 if field is version_field else value,
+            )
+            for field, model, value in values
+        ]
+        if not super()._do_update(
+            base_qs.filter(version=self.version),
+            using,
+            pk_val,
+            values,
+            update_fields,
+            forced_update,
+        ):
+            raise VersionConflict(
+                f'{self._meta.object_name} {pk_val} is not '
+                f'at version {self.version}.'
+            )
+        self.version += 1
+        return True
+
     class Meta:
         ordering = ['-created_at']
         constraints = [
@@ -53,3 +216,65 @@ class Note(Model):
                 fields=['author', 'title'],
             ),
         ]
+        indexes = [
+            Index(
+                name='note_author_created_at_idx',
+                fields=['author', '-created_at', '-id'],
+            ),
+            Index(
+                name='note_author_updated_at_idx',
+                fields=['author', 'updated_at'],
+            ),
+            GinIndex(
+                name='note_search_vector_idx',
+                fields=['search_vector'],
+            ),
+            GinIndex(
+                OpClass(Upper('title'), name='gin_trgm_ops'),
+                name='note_title_trgm_idx',
+            ),
+            GinIndex(
+                OpClass(Upper('text'), name='gin_trgm_ops'),
+                name='note_text_trgm_idx',
+            ),
+        ]
+
+
+class DeletedRecord(Model):
+    """Tombstone of a deleted note or tag."""
+
+    author = ForeignKey(User, on_delete=CASCADE)
+    model_name = CharField(max_length=MAX_MODEL_NAME_LENGTH)
+    object_id = PositiveBigIntegerField()
+    deleted_at = DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f'{self.model_name} {self.object_id}'
+
+    class Meta:
+        indexes = [
+            Index(
+                name='deleted_author_deleted_at_idx',
+                fields=['author', 'deleted_at'],
+            ),
+        ]
+
+
+class NoteDailyStats(Model):
+    """Rollup of notes created per author and day in TIME_ZONE."""
+
+    author = ForeignKey(User, on_delete=CASCADE)
+    date = DateField()
+    notes_count = IntegerField(default=0)
+    text_length = BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f'{self.author} {self.date}'
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                name='Unique daily stats for author',
+                fields=['author', 'date'],
+            ),
+        ]
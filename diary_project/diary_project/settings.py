@@ -34,10 +34,21 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication'
+        'api.authentication.CachedTokenAuthentication'
     ],
 }
 
+if BOOLEAN_MAP.get(os.getenv('API_FAST_JSON', 'false').lower()):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -45,6 +56,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'djoser',
@@ -64,6 +76,16 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if BOOLEAN_MAP.get(os.getenv('API_PROFILING', 'false').lower()):
+    MIDDLEWARE.insert(0, 'api.profiling.ProfilingMiddleware')
+
+if BOOLEAN_MAP.get(os.getenv('API_METRICS', 'false').lower()):
+    MIDDLEWARE.insert(0, 'api.metrics.MetricsMiddleware')
+
+METRICS_ALLOWED_IPS = list(
+    filter(None, os.getenv('METRICS_ALLOWED_IPS', '').split(','))
+)
+
 ROOT_URLCONF = 'diary_project.urls'
 
 TEMPLATES = [
@@ -93,9 +115,57 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', 5432),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': BOOLEAN_MAP.get(
+            os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower()
+        ),
     }
 }
 
+if BOOLEAN_MAP.get(os.getenv('DB_POOL', 'false').lower()):
+    # Pooled connections are returned to the pool after every request.
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        },
+    }
+
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))
+):
+    DATABASES[f'replica_{index}'] = DATABASES['default'] | {
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+
+REPLICA_READ_YOUR_WRITES_WINDOW = int(
+    os.getenv('DB_REPLICA_READ_YOUR_WRITES_WINDOW', 5)
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+LIST_CACHE_TIMEOUT = int(os.getenv('LIST_CACHE_TIMEOUT', 300))
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', 300))
+
+NOTE_STATS_ROLLUP = BOOLEAN_MAP.get(
+    os.getenv('NOTE_STATS_ROLLUP', 'false').lower()
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
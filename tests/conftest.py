@@ -1,6 +1,8 @@
 from typing import Callable
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
 from pytest import fixture
 from rest_framework.test import APIClient
 
@@ -8,6 +10,17 @@ from diary.models import Note, Tag
 
 User = get_user_model()
 
+REPLICA = 'replica'
+
+
+@fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """Add replica alias, a separate connection to the test database."""
+    default = connections.settings['default']
+    connections.settings[REPLICA] = default | {
+        'TEST': default['TEST'] | {'MIRROR': 'default'},
+    }
+
 
 @fixture
 def create_note() -> Callable[..., Note]:
@@ -70,3 +83,9 @@ def some_tag(valid_tag_data):
 @fixture
 def some_note(valid_note_data, create_note):
     return create_note(**valid_note_data)
+
+
+@fixture(autouse=True)
+def clear_cache():
+    yield
+    cache.clear()
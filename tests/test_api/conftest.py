@@ -6,6 +6,7 @@ from django.contrib.auth.models import AbstractUser
 from django.urls import reverse
 from django.utils.timezone import datetime, localtime
 from pytest import fixture
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 from diary.models import Note, Tag
@@ -30,6 +31,7 @@ def note_to_json(to_local_time):
             'text': note.text,
             'created_at': to_local_time(note.created_at).isoformat(),
             'tags': [tag.name for tag in note.tags.all()],
+            'version': note.version,
         }
 
     return _note_to_json
@@ -38,7 +40,11 @@ def note_to_json(to_local_time):
 @fixture
 def tag_to_json():
     def _tag_to_json(tag: Tag) -> dict:
-        return {'id': tag.id, 'name': tag.name}
+        return {
+            'id': tag.id,
+            'name': tag.name,
+            'notes_count': tag.notes.count(),
+        }
 
     return _tag_to_json
 
@@ -118,6 +124,11 @@ def tag_list_url():
     return reverse('api:tags-list')
 
 
+@fixture
+def tag_cloud_url():
+    return reverse('api:tags-cloud')
+
+
 @fixture
 def tag_detail_url(some_tag):
     return reverse('api:tags-detail', kwargs={'pk': some_tag.pk})
@@ -128,6 +139,26 @@ def note_list_url():
     return reverse('api:notes-list')
 
 
+@fixture
+def note_bulk_url():
+    return reverse('api:notes-bulk')
+
+
+@fixture
+def note_bulk_delete_url():
+    return reverse('api:notes-bulk-delete')
+
+
+@fixture
+def note_bulk_tags_url():
+    return reverse('api:notes-bulk-tags')
+
+
+@fixture
+def note_export_url():
+    return reverse('api:notes-export')
+
+
 @fixture
 def note_detail_url(some_note):
     return reverse('api:notes-detail', kwargs={'pk': some_note.pk})
@@ -166,3 +197,68 @@ def token_login_url():
 @fixture
 def token_logout_url():
     return reverse('api:logout')
+
+
+@fixture
+def author_token_client(creative_user):
+    client = APIClient(enforce_csrf_checks=True)
+    token = Token.objects.create(user=creative_user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+@fixture
+def another_token_client(another_user):
+    client = APIClient(enforce_csrf_checks=True)
+    token = Token.objects.create(user=another_user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+@fixture
+def async_note_list_url():
+    return reverse('api:async-notes-list')
+
+
+@fixture
+def async_note_detail_url(some_note):
+    return reverse('api:async-notes-detail', kwargs={'pk': some_note.pk})
+
+
+@fixture
+def async_tag_list_url():
+    return reverse('api:async-tags-list')
+
+
+@fixture
+def async_tag_detail_url(some_tag):
+    return reverse('api:async-tags-detail', kwargs={'pk': some_tag.pk})
+
+
+@fixture
+def sync_url():
+    return reverse('api:sync')
+
+
+@fixture
+def staff_client():
+    client = APIClient()
+    client.force_authenticate(
+        User.objects.create_user('staff_user', is_staff=True)
+    )
+    return client
+
+
+@fixture
+def profiling_url():
+    return reverse('api:profiling')
+
+
+@fixture
+def metrics_url():
+    return reverse('metrics')
+
+
+@fixture
+def note_stats_url():
+    return reverse('api:notes-stats')
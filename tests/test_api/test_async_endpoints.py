@@ -0,0 +1,160 @@
+from pytest import mark
+from pytest_lazy_fixtures import lf
+from rest_framework import status
+
+from diary.models import Note, Tag
+
+pytestmark = mark.django_db
+
+
+@mark.usefixtures('some_note', 'some_tag')
+@mark.parametrize(
+    'url,expected_json',
+    [
+        (lf('async_note_list_url'), lf('note_to_json')),
+        (lf('async_tag_list_url'), lf('tag_to_json')),
+    ],
+)
+def test_async_list(author_token_client, url, expected_json):
+    response = author_token_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    model = Note if 'notes' in url else Tag
+    assert response.json() == {
+        'next': None,
+        'results': [expected_json(obj) for obj in model.objects.all()],
+    }
+
+
+@mark.parametrize(
+    'url,obj,expected_json',
+    [
+        (
+            lf('async_note_detail_url'),
+            lf('some_note'),
+            lf('note_to_json'),
+        ),
+        (
+            lf('async_tag_detail_url'),
+            lf('some_tag'),
+            lf('tag_to_json'),
+        ),
+    ],
+)
+def test_async_retrieve(author_token_client, url, obj, expected_json):
+    response = author_token_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == expected_json(obj)
+
+
+@mark.parametrize(
+    'url,data',
+    [
+        (lf('async_note_list_url'), lf('new_note_data')),
+        (lf('async_tag_list_url'), lf('new_tag_data')),
+    ],
+)
+def test_async_create(author_token_client, creative_user, url, data):
+    response = author_token_client.post(url, data, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    content = response.json()
+    model = Note if 'notes' in url else Tag
+    obj = model.objects.get(pk=content['id'])
+    assert obj.author == creative_user
+    if model is Note:
+        assert content['tags'] == sorted(
+            obj.tags.values_list('name', flat=True)
+        )
+        assert content['title'] == data['title']
+    else:
+        assert content == {
+            'id': obj.id,
+            'name': data['name'],
+            'notes_count': 0,
+        }
+
+
+@mark.django_db(transaction=True)
+@mark.parametrize(
+    'url,data,message',
+    [
+        (
+            lf('async_note_list_url'),
+            {'title': 'some title', 'text': '', 'tags': []},
+            'Note with title some title exists!',
+        ),
+        (
+            lf('async_tag_list_url'),
+            {'name': 'some_tag'},
+            'Tag with name some_tag exists!',
+        ),
+    ],
+)
+@mark.usefixtures('some_note')
+def test_async_create_duplicate(author_token_client, url, data, message):
+    response = author_token_client.post(url, data, format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == [message]
+
+
+@mark.parametrize(
+    'url',
+    [
+        lf('async_note_list_url'),
+        lf('async_note_detail_url'),
+        lf('async_tag_list_url'),
+        lf('async_tag_detail_url'),
+    ],
+)
+def test_async_unauthorized(client, url):
+    response = client.get(url)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response['WWW-Authenticate'] == 'Token'
+
+    response = client.get(url, headers={'Authorization': 'Token invalid'})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json() == {'detail': 'Invalid token.'}
+
+
+@mark.parametrize(
+    'url',
+    [lf('async_note_detail_url'), lf('async_tag_detail_url')],
+)
+def test_async_cannot_see_other_users_objects(another_token_client, url):
+    response = another_token_client.get(url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_async_list_pagination(
+    author_token_client, async_note_list_url, creative_user
+):
+    Note.objects.bulk_create(
+        [Note(author=creative_user, title=f'note {i}') for i in range(7)]
+    )
+
+    ids = []
+    url = f'{async_note_list_url}?page_size=3'
+    for _ in range(5):
+        content = author_token_client.get(url).json()
+        ids += [note['id'] for note in content['results']]
+        if not (url := content['next']):
+            break
+
+    assert url is None
+    assert ids == list(
+        Note.objects.order_by('-created_at', '-id').values_list(
+            'id', flat=True
+        )
+    )
+
+
+def test_async_invalid_cursor(author_token_client, async_note_list_url):
+    response = author_token_client.get(f'{async_note_list_url}?cursor=bad')
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
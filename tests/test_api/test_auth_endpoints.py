@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from pytest import mark
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest import fixture, mark
 from pytest_lazy_fixtures import lf
 from rest_framework import status
 from rest_framework.authtoken.models import Token
@@ -9,6 +11,11 @@ User = get_user_model()
 pytestmark = mark.django_db
 
 
+@fixture
+def some_user_token(some_user):
+    return Token.objects.create(user=some_user).key
+
+
 new_user_data = {
     'username': 'new_user',
     'email': 'new_user@mail.com',
@@ -279,3 +286,80 @@ def test_cannot_delete_other_user_profile(
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
     assert user_count - User.objects.count() == 0
+
+
+def test_cached_token_skips_auth_query(
+    client,
+    some_user_token,
+    user_profile_url,
+):
+    headers = {'Authorization': f'Token {some_user_token}'}
+    with CaptureQueriesContext(connection) as uncached:
+        client.get(user_profile_url, headers=headers)
+    uncached_count = len(uncached)
+
+    with CaptureQueriesContext(connection) as cached:
+        response = client.get(user_profile_url, headers=headers)
+    cached_count = len(cached)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert cached_count == uncached_count - 1
+    assert not any(
+        'authtoken_token' in q['sql'] for q in cached.captured_queries
+    )
+
+
+def test_logout_invalidates_cached_token(
+    client,
+    some_user_token,
+    user_profile_url,
+    token_logout_url,
+):
+    headers = {'Authorization': f'Token {some_user_token}'}
+    client.get(user_profile_url, headers=headers)
+
+    client.post(token_logout_url, headers=headers)
+    response = client.get(user_profile_url, headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_deactivation_invalidates_cached_token(
+    client,
+    some_user,
+    some_user_token,
+    user_profile_url,
+):
+    headers = {'Authorization': f'Token {some_user_token}'}
+    client.get(user_profile_url, headers=headers)
+
+    some_user.is_active = False
+    some_user.save()
+    response = client.get(user_profile_url, headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_password_change_invalidates_cached_token(
+    client,
+    some_user,
+    some_user_token,
+    user_password,
+    user_profile_url,
+    user_set_password_url,
+):
+    headers = {'Authorization': f'Token {some_user_token}'}
+    new_password = 'S3cr37P@55w0r6'
+
+    client.post(
+        user_set_password_url,
+        data={
+            'new_password': new_password,
+            'current_password': user_password,
+        },
+        headers=headers,
+    )
+    response = client.get(user_profile_url, headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.wsgi_request.user.check_password(new_password)
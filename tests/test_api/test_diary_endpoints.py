@@ -1,5 +1,10 @@
+import csv
+import io
+import json
 from random import choice, choices
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from pytest import fixture, mark
 from pytest_lazy_fixtures import lf, lfc
 from rest_framework import status
@@ -18,6 +23,7 @@ def updated_note_json(
     return {
         'id': some_note.id,
         'created_at': to_local_time(some_note.created_at).isoformat(),
+        'version': some_note.version + 1,
     } | new_note_data
 
 
@@ -26,7 +32,7 @@ def updated_tag_json(
     some_tag,
     new_tag_data,
 ):
-    return {'id': some_tag.id} | new_tag_data
+    return {'id': some_tag.id, 'notes_count': 0} | new_tag_data
 
 
 @mark.usefixtures('some_note', 'some_tag')
@@ -37,7 +43,11 @@ def updated_tag_json(
             lf('author_client'),
             lf('note_list_url'),
             status.HTTP_200_OK,
-            [lfc('note_to_json', lf('some_note'))],
+            {
+                'next': None,
+                'previous': None,
+                'results': [lfc('note_to_json', lf('some_note'))],
+            },
         ],
         [
             lf('author_client'),
@@ -49,7 +59,7 @@ def updated_tag_json(
             lf('another_client'),
             lf('note_list_url'),
             status.HTTP_200_OK,
-            [],
+            {'next': None, 'previous': None, 'results': []},
         ],
         [
             lf('another_client'),
@@ -154,6 +164,58 @@ def test_prevent_create_duplicate(
     assert model.objects.count() == obj_count
 
 
+@mark.parametrize(
+    'url,new_data,table',
+    [
+        [lf('note_list_url'), lf('new_note_data'), 'diary_note'],
+        [lf('tag_list_url'), lf('new_tag_data'), 'diary_tag'],
+    ],
+)
+def test_create_does_not_check_duplicates_with_select(
+    author_client,
+    url,
+    new_data,
+    table,
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.post(url, data=new_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert not any(
+        query['sql'].startswith(f'SELECT "{table}"') for query in queries
+    )
+
+
+@mark.parametrize(
+    'url,data',
+    [
+        [
+            lf('note_detail_url'),
+            {
+                'title': 'some title',
+                'text': 'Updated text',
+                'tags': ['some_tag'],
+            },
+        ],
+        [lf('tag_detail_url'), {'name': 'some_tag'}],
+    ],
+)
+def test_update_keeping_unique_field(author_client, url, data):
+    response = author_client.put(url, data=data)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_update_to_duplicate_title(
+    author_client,
+    note_detail_url,
+    note_list_url,
+    new_note_data,
+):
+    author_client.post(note_list_url, data=new_note_data)
+
+    response = author_client.put(note_detail_url, data=new_note_data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @mark.parametrize('method', ['put', 'patch'])
 @mark.parametrize(
     'client,status_code,to_json,expected_json,url,new_data,model,current_obj',
@@ -272,10 +334,50 @@ def test_delete(
 def test_notes_ordering(author_client, note_list_url):
     response = author_client.get(note_list_url)
 
-    notes = response.json()
+    notes = response.json()['results']
     assert notes == sorted(notes, key=lambda x: x['created_at'], reverse=True)
 
 
+@mark.usefixtures('create_many_notes')
+def test_notes_pagination(author_client, note_list_url):
+    notes = []
+    url = note_list_url + '?page_size=7'
+    while url:
+        response = author_client.get(url)
+        assert len(response.json()['results']) <= 7
+        notes.extend(response.json()['results'])
+        url = response.json()['next']
+
+    notes_ids = [note['id'] for note in notes]
+    db_ids = [note.id for note in Note.objects.order_by('-created_at', '-id')]
+    assert notes_ids == db_ids
+
+
+def test_notes_pagination_with_equal_created_at(
+    author_client,
+    note_list_url,
+    create_note,
+    creative_user,
+):
+    notes_count = 5
+    for i in range(notes_count):
+        create_note(author=creative_user, title=f'Note {i}', tags=[])
+    Note.objects.update(created_at=Note.objects.first().created_at)
+
+    paged_ids = []
+    url = note_list_url + '?page_size=2'
+    for _ in range(notes_count):
+        response = author_client.get(url)
+        paged_ids.extend(item['id'] for item in response.json()['results'])
+        url = response.json()['next']
+        if url is None:
+            break
+    assert url is None
+
+    db_ids = [note.id for note in Note.objects.order_by('-id')]
+    assert paged_ids == db_ids
+
+
 @mark.usefixtures('create_many_tags')
 def test_tags_ordering(author_client, tag_list_url):
     response = author_client.get(tag_list_url)
@@ -284,12 +386,38 @@ def test_tags_ordering(author_client, tag_list_url):
     assert tags == sorted(tags, key=lambda x: x['name'])
 
 
+@mark.usefixtures('create_many_notes')
+def test_tags_notes_count(author_client, tag_list_url, tag_to_json):
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.get(tag_list_url)
+    assert len(queries) == 1
+    assert response.json() == [
+        tag_to_json(tag) for tag in Tag.objects.order_by('name')
+    ]
+
+
+@mark.usefixtures('create_many_notes')
+def test_tag_cloud(author_client, tag_cloud_url):
+    response = author_client.get(tag_cloud_url + '?limit=5')
+    assert response.status_code == status.HTTP_200_OK
+
+    expected = sorted(
+        (
+            {'name': tag.name, 'notes_count': tag.notes.count()}
+            for tag in Tag.objects.all()
+        ),
+        key=lambda tag: (-tag['notes_count'], tag['name']),
+    )
+    expected = [tag for tag in expected if tag['notes_count']][:5]
+    assert response.json() == expected
+
+
 @mark.usefixtures('create_many_notes')
 def test_note_title_filter(author_client, note_list_url):
     query = choice(choice(Note.objects.all()).title)
 
     response = author_client.get(note_list_url + f'?title={query}')
-    response_ids = sorted(item['id'] for item in response.json())
+    response_ids = sorted(item['id'] for item in response.json()['results'])
     db_ids = sorted(
         note.id for note in Note.objects.filter(title__icontains=query)
     )
@@ -306,7 +434,7 @@ def test_note_tags_filter(author_client, note_list_url):
     query = '&'.join(f'tags={name}' for name in random_tag_names)
 
     response = author_client.get(note_list_url + f'?{query}')
-    response_ids = sorted(item['id'] for item in response.json())
+    response_ids = sorted(item['id'] for item in response.json()['results'])
     db_ids = sorted(
         {
             note.id
@@ -317,6 +445,145 @@ def test_note_tags_filter(author_client, note_list_url):
     assert response_ids == db_ids
 
 
+def test_note_search(
+    author_client,
+    note_list_url,
+    create_note,
+    creative_user,
+):
+    text_match = create_note(
+        author=creative_user,
+        title='Monday',
+        text='Went hiking in the mountains',
+        tags=[],
+    )
+    title_match = create_note(
+        author=creative_user,
+        title='Mountains trip',
+        text='Packed the bags',
+        tags=[],
+    )
+    substring_match = create_note(
+        author=creative_user,
+        title='Tuesday',
+        text='Visited Supermountainsville',
+        tags=[],
+    )
+    create_note(
+        author=creative_user,
+        title='Wednesday',
+        text='Stayed at home',
+        tags=[],
+    )
+
+    response = author_client.get(note_list_url + '?q=mountains')
+    response_ids = [item['id'] for item in response.json()['results']]
+    assert response_ids == [title_match.id, text_match.id, substring_match.id]
+
+    response = author_client.get(note_list_url + '?q=mo')
+    assert response.json()['results'] == []
+
+
+def test_note_search_pagination(
+    author_client,
+    note_list_url,
+    create_note,
+    creative_user,
+):
+    notes_count = 7
+    for i in range(notes_count):
+        create_note(
+            author=creative_user,
+            title=f'Note {i}',
+            text='Walked the dog' + ' again' * i,
+            tags=[],
+        )
+
+    paged_ids = []
+    url = note_list_url + '?q=walk&limit=2'
+    for _ in range(notes_count):
+        response = author_client.get(url)
+        paged_ids.extend(item['id'] for item in response.json()['results'])
+        url = response.json()['next']
+        if url is None:
+            break
+    assert url is None
+
+    response = author_client.get(note_list_url + '?q=walk')
+    ranked_ids = [item['id'] for item in response.json()['results']]
+    assert paged_ids == ranked_ids
+    assert len(set(paged_ids)) == notes_count
+
+
+@mark.usefixtures('some_note')
+def test_note_list_does_not_load_search_vector(author_client, note_list_url):
+    with CaptureQueriesContext(connection) as queries:
+        author_client.get(note_list_url)
+    assert not any('search_vector' in query['sql'] for query in queries)
+
+
+@mark.parametrize(
+    'query,expected_fields',
+    [
+        (
+            'fields=id,title,created_at,tags',
+            {'id', 'title', 'created_at', 'tags'},
+        ),
+        ('omit=text', {'id', 'title', 'created_at', 'tags', 'version'}),
+        ('fields=id,text&omit=text', {'id'}),
+    ],
+)
+@mark.parametrize('url', [lf('note_list_url'), lf('note_detail_url')])
+def test_note_sparse_fieldsets(
+    author_client, some_note, note_to_json, url, query, expected_fields
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.get(f'{url}?{query}')
+    selects = [q['sql'] for q in queries if 'FROM "diary_note"' in q['sql']]
+
+    assert response.status_code == status.HTTP_200_OK
+    content = response.json()
+    item = content['results'][0] if 'results' in content else content
+    assert item == {
+        key: value
+        for key, value in note_to_json(some_note).items()
+        if key in expected_fields
+    }
+    assert selects
+    assert not any('"diary_note"."text"' in sql for sql in selects)
+    if 'tags' not in expected_fields:
+        assert not any('diary_note_tags' in q['sql'] for q in queries)
+
+
+@mark.parametrize('param', ['fields', 'omit'])
+def test_note_sparse_fieldsets_unknown_field(
+    author_client, note_list_url, param
+):
+    response = author_client.get(f'{note_list_url}?{param}=title,author')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {param: ['Unknown fields: author.']}
+
+
+@mark.usefixtures('create_many_notes')
+def test_note_all_tags_filter(author_client, note_list_url):
+    note_tags = list(choice(Note.objects.all()).tags.all())
+    random_tag_names = {tag.name for tag in choices(note_tags, k=2)}
+
+    query = '&'.join(f'all_tags={name}' for name in random_tag_names)
+
+    response = author_client.get(note_list_url + f'?{query}')
+    response_ids = sorted(item['id'] for item in response.json()['results'])
+    db_ids = sorted(
+        note.id
+        for note in Note.objects.all()
+        if random_tag_names <= {tag.name for tag in note.tags.all()}
+    )
+
+    assert response_ids == db_ids
+    assert response_ids
+
+
 @mark.usefixtures('create_many_tags')
 def test_tag_name_filter(author_client, tag_list_url):
     query = choice(choice(Tag.objects.all()).name)
@@ -330,6 +597,211 @@ def test_tag_name_filter(author_client, tag_list_url):
     assert response_ids == db_ids
 
 
+@mark.usefixtures('some_note')
+def test_bulk_import_ndjson(author_client, note_bulk_url, some_note):
+    rows = [
+        json.dumps({'title': 'first', 'text': 'a', 'tags': ['x', 'y']}),
+        '{not json',
+        json.dumps({'title': some_note.title, 'tags': []}),
+        json.dumps({'text': 'no title'}),
+        '',
+        json.dumps({'title': 'second', 'tags': ['x', 'some_tag']}),
+        json.dumps({'title': 'first', 'tags': []}),
+    ]
+
+    response = author_client.post(
+        note_bulk_url,
+        data='\n'.join(rows),
+        content_type='application/x-ndjson',
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['created'] == 2
+    assert [error['row'] for error in response.json()['errors']] == [
+        1,
+        2,
+        3,
+        5,
+    ]
+
+    first = Note.objects.get(title='first')
+    assert first.text == 'a'
+    assert sorted(tag.name for tag in first.tags.all()) == ['x', 'y']
+    assert Tag.objects.filter(name='x').count() == 1
+    assert Tag.objects.filter(name='some_tag').count() == 1
+
+
+def test_bulk_import_json_array(author_client, note_bulk_url):
+    rows = [{'title': f'note {i}', 'tags': ['bulk']} for i in range(10)]
+
+    response = author_client.post(note_bulk_url, data=rows, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'created': 10, 'errors': []}
+    assert Tag.objects.get(name='bulk').notes.count() == 10
+
+
+def test_bulk_import_invalid_json_array(author_client, note_bulk_url):
+    response = author_client.post(
+        note_bulk_url,
+        data='[{"title": "note"}',
+        content_type='application/json',
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_bulk_import_query_count_does_not_grow(author_client, note_bulk_url):
+    def import_rows(rows_count, prefix):
+        rows = [
+            {'title': f'{prefix} {i}', 'tags': [f'{prefix}_{i}', 'common']}
+            for i in range(rows_count)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            author_client.post(note_bulk_url, data=rows, format='json')
+        return len(queries)
+
+    assert import_rows(5, 'small') == import_rows(50, 'large')
+
+
+@mark.usefixtures('create_many_notes')
+@mark.parametrize(
+    'export_format,content_type,parse',
+    [
+        [
+            'ndjson',
+            'application/x-ndjson',
+            lambda content: [
+                json.loads(line) for line in content.splitlines()
+            ],
+        ],
+        ['json', 'application/json', json.loads],
+        [
+            'csv',
+            'text/csv',
+            lambda content: [
+                row
+                | {
+                    'id': int(row['id']),
+                    'tags': row['tags'].split(','),
+                    'version': int(row['version']),
+                }
+                for row in csv.DictReader(io.StringIO(content))
+            ],
+        ],
+    ],
+)
+def test_export(
+    author_client,
+    note_export_url,
+    note_to_json,
+    export_format,
+    content_type,
+    parse,
+):
+    response = author_client.get(
+        note_export_url + f'?export_format={export_format}'
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == content_type
+
+    content = b''.join(response.streaming_content).decode()
+    assert parse(content) == [
+        note_to_json(note) for note in Note.objects.all()
+    ]
+
+
+def test_export_invalid_format(author_client, note_export_url):
+    response = author_client.get(note_export_url + '?export_format=xml')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@mark.usefixtures('some_note', 'some_tag')
+@mark.parametrize('url', [lf('note_list_url'), lf('tag_list_url')])
+def test_list_is_cached(author_client, url):
+    response = author_client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        cached_response = author_client.get(url)
+    assert len(queries) == 0
+    assert cached_response.json() == response.json()
+
+
+@mark.parametrize(
+    'url,new_data,model',
+    [
+        [lf('note_list_url'), lf('new_note_data'), Note],
+        [lf('tag_list_url'), lf('new_tag_data'), Tag],
+    ],
+)
+def test_list_cache_invalidated_on_create(author_client, url, new_data, model):
+    author_client.get(url)
+    author_client.post(url, data=new_data)
+
+    response = author_client.get(url)
+    results = response.json()
+    if model is Note:
+        results = results['results']
+    assert len(results) == model.objects.count()
+
+
+def test_list_cache_invalidated_on_tag_change(
+    author_client,
+    note_list_url,
+    some_note,
+    some_tag,
+):
+    author_client.get(note_list_url)
+    some_note.tags.remove(some_tag)
+
+    response = author_client.get(note_list_url)
+    assert response.json()['results'][0]['tags'] == []
+
+
+def test_list_cache_is_per_user(author_client, another_client, tag_list_url):
+    author_client.post(tag_list_url, data={'name': 'private'})
+    author_client.get(tag_list_url)
+
+    response = another_client.get(tag_list_url)
+    assert response.json() == []
+
+
+@mark.parametrize(
+    'url',
+    [
+        lf('note_list_url'),
+        lf('note_detail_url'),
+        lf('tag_list_url'),
+        lf('tag_detail_url'),
+    ],
+)
+def test_conditional_get(author_client, url):
+    response = author_client.get(url)
+    assert response.has_header('Last-Modified')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.get(
+            url, headers={'If-None-Match': response['ETag']}
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(queries) == 0
+
+
+def test_conditional_get_after_change(
+    author_client,
+    note_list_url,
+    some_note,
+):
+    etag = author_client.get(note_list_url)['ETag']
+
+    some_note.text = 'Changed text'
+    some_note.save()
+
+    response = author_client.get(
+        note_list_url, headers={'If-None-Match': etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'] != etag
+    assert response.json()['results'][0]['text'] == 'Changed text'
+
+
 @mark.parametrize(
     'url,method',
     [
@@ -351,3 +823,185 @@ def test_unauthorized_request(client, url, method):
     request_func = getattr(client, method)
     response = request_func(url)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@mark.usefixtures('create_many_notes')
+def test_note_list_query_count_does_not_grow(
+    author_client,
+    note_list_url,
+    create_note,
+    creative_user,
+):
+    with CaptureQueriesContext(connection) as initial_queries:
+        author_client.get(note_list_url)
+    initial_query_count = len(initial_queries)
+
+    tags = Tag.objects.filter(author=creative_user)
+    for i in range(20):
+        create_note(
+            author=creative_user,
+            title=f'extra note {i}',
+            tags=choices(tags, k=3),
+        )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.get(note_list_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(queries) == initial_query_count
+
+
+def test_create_note_tag_query_count_does_not_grow(
+    author_client,
+    note_list_url,
+    new_note_data,
+):
+    with CaptureQueriesContext(connection) as initial_queries:
+        author_client.post(note_list_url, data=new_note_data)
+    initial_query_count = len(initial_queries)
+
+    many_tags_note_data = new_note_data | {
+        'title': 'many_tags_note',
+        'tags': [f'tag_{i}' for i in range(30)],
+    }
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.post(note_list_url, data=many_tags_note_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(queries) == initial_query_count
+
+
+@fixture
+def another_user_note(another_user, create_note):
+    return create_note(author=another_user, title='not yours', tags=[])
+
+
+@mark.usefixtures('create_many_notes')
+def test_bulk_delete_notes_by_ids(
+    author_client, note_bulk_delete_url, creative_user, another_user_note
+):
+    ids = list(
+        Note.objects.filter(author=creative_user).values_list('id', flat=True)
+    )[:5]
+
+    response = author_client.post(
+        note_bulk_delete_url,
+        data={'ids': [*ids, another_user_note.id]},
+        format='json',
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'deleted': 5}
+    assert not Note.objects.filter(id__in=ids).exists()
+    assert Note.objects.filter(id=another_user_note.id).exists()
+    assert Note.objects.filter(author=creative_user).count() == 15
+
+
+@mark.usefixtures('create_many_notes', 'another_user_note')
+def test_bulk_delete_notes_by_filter(
+    author_client, note_bulk_delete_url, creative_user
+):
+    tag = Tag.objects.filter(author=creative_user, notes__isnull=False)[0]
+    tagged_count = tag.notes.count()
+
+    response = author_client.post(
+        note_bulk_delete_url + f'?tags={tag.name}', format='json'
+    )
+
+    assert response.json() == {'deleted': tagged_count}
+    assert not tag.notes.exists()
+    assert Note.objects.count() == 21 - tagged_count
+
+
+@mark.usefixtures('create_many_notes')
+@mark.parametrize('query', ['', '?ordering=title'])
+def test_bulk_delete_requires_selection(
+    author_client, note_bulk_delete_url, query
+):
+    response = author_client.post(note_bulk_delete_url + query, format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Note.objects.count() == 20
+
+
+@mark.usefixtures('create_many_notes')
+def test_bulk_tags(
+    author_client, note_bulk_tags_url, creative_user, another_user_note
+):
+    notes = list(Note.objects.filter(author=creative_user)[:5])
+    removed_tag = notes[0].tags.all()[0]
+
+    response = author_client.post(
+        note_bulk_tags_url,
+        data={
+            'ids': [note.id for note in notes] + [another_user_note.id],
+            'add': ['added_tag', removed_tag.name + '_new'],
+            'remove': [removed_tag.name],
+        },
+        format='json',
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'updated': 5}
+    for note in notes:
+        names = set(note.tags.values_list('name', flat=True))
+        assert {'added_tag', removed_tag.name + '_new'} <= names
+        assert removed_tag.name not in names
+    assert not another_user_note.tags.exists()
+    assert Tag.objects.get(name='added_tag').author == creative_user
+
+
+@mark.parametrize(
+    'data',
+    [
+        {'ids': [1]},
+        {'ids': [1], 'add': ['same'], 'remove': ['same']},
+        {'ids': [1], 'add': ['not a slug']},
+    ],
+)
+def test_bulk_tags_invalid_data(author_client, note_bulk_tags_url, data):
+    response = author_client.post(note_bulk_tags_url, data=data, format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@mark.parametrize(
+    'url,data',
+    [
+        (lf('note_bulk_delete_url'), {}),
+        (lf('note_bulk_tags_url'), {'add': ['bulk_tag'], 'remove': ['x']}),
+    ],
+)
+def test_bulk_actions_query_count_does_not_grow(
+    author_client, creative_user, create_note, url, data
+):
+    def run(notes_count):
+        ids = [
+            create_note(
+                author=creative_user, title=f'{notes_count} {i}', tags=[]
+            ).id
+            for i in range(notes_count)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = author_client.post(
+                url, data=data | {'ids': ids}, format='json'
+            )
+        assert response.status_code == status.HTTP_200_OK
+        return len(queries)
+
+    run(1)  # Creates the added tag.
+    assert run(2) == run(30)
+
+
+@mark.usefixtures('some_note')
+def test_bulk_tags_invalidates_list_cache(
+    author_client, note_list_url, note_bulk_tags_url, some_note
+):
+    author_client.get(note_list_url)
+
+    author_client.post(
+        note_bulk_tags_url,
+        data={'ids': [some_note.id], 'add': ['fresh_tag']},
+        format='json',
+    )
+    response = author_client.get(note_list_url)
+
+    assert 'fresh_tag' in response.json()['results'][0]['tags']
@@ -0,0 +1,88 @@
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from io import BytesIO
+from uuid import UUID
+
+from django.db.models import Count
+from django.utils.translation import gettext_lazy
+from pytest import mark, raises
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.serializers import NoteSerializer, TagSerializer
+from diary.models import Note, Tag
+
+pytestmark = mark.django_db
+
+
+@mark.parametrize(
+    'data',
+    [
+        None,
+        [],
+        {
+            'id': 1,
+            'title': 'Заметка',
+            'text': 'Line\u2028break\u2029',
+            'x': None,
+        },
+        {
+            'when': datetime(
+                2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc
+            )
+        },
+        {'day': date(2024, 5, 1), 'at': time(12, 30, 15, 123456)},
+        {'amount': Decimal('1.50'), 'uuid': UUID(int=1), 'ok': True},
+        {1: 'int key', 'lazy': gettext_lazy('Invalid token.')},
+        [{'nested': [1, 2.5, -3, 'a"b\\c']}],
+    ],
+)
+def test_orjson_renderer_matches_json_renderer(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_renderer_falls_back_for_indent():
+    data = {'id': 1}
+    media_type = 'application/json; indent=4'
+
+    assert ORJSONRenderer().render(data, media_type) == (
+        JSONRenderer().render(data, media_type)
+    )
+
+
+def test_orjson_parser():
+    assert ORJSONParser().parse(BytesIO('{"a": ["б", 1]}'.encode())) == {
+        'a': ['б', 1]
+    }
+    with raises(ParseError):
+        ORJSONParser().parse(BytesIO(b'{"a": NaN}'))
+
+
+@mark.usefixtures('create_many_notes')
+def test_note_values_representation(creative_user):
+    notes = Note.objects.filter(author=creative_user).prefetch_related('tags')
+    serializer = NoteSerializer()
+
+    assert (
+        serializer.represent_values(
+            notes.values(*serializer.get_values_fields())
+        )
+        == NoteSerializer(notes, many=True).data
+    )
+
+
+@mark.usefixtures('create_many_notes')
+def test_tag_values_representation(creative_user):
+    tags = Tag.objects.filter(author=creative_user).annotate(
+        notes_count=Count('notes')
+    )
+    serializer = TagSerializer()
+
+    assert (
+        serializer.represent_values(
+            tags.values(*serializer.get_values_fields())
+        )
+        == TagSerializer(tags, many=True).data
+    )
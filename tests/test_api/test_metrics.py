@@ -0,0 +1,120 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings as django_settings
+from prometheus_client import REGISTRY
+from pytest import fixture, mark
+from pytest_lazy_fixtures import lf
+from rest_framework import status
+
+from api.metrics import collect_metrics
+
+pytestmark = mark.django_db
+
+RECORD_RESPONSE = (
+    'from api.metrics import RESPONSES; '
+    'RESPONSES.labels("api:notes-list", "GET", 200).inc()'
+)
+
+
+@fixture
+def metrics_middleware(settings):
+    settings.MIDDLEWARE = [
+        'api.metrics.MetricsMiddleware',
+        *settings.MIDDLEWARE,
+    ]
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_request_metrics(metrics_middleware, author_client, note_list_url):
+    labels = {'route': 'api:notes-list', 'method': 'GET'}
+    latency_count = sample('api_request_duration_seconds_count', **labels)
+    responses = sample('api_responses_total', **labels, status='200')
+    queries = sample('api_db_queries_per_request_sum', route=labels['route'])
+
+    author_client.get(note_list_url)
+
+    assert sample('api_request_duration_seconds_count', **labels) == (
+        latency_count + 1
+    )
+    assert sample('api_responses_total', **labels, status='200') == (
+        responses + 1
+    )
+    assert (
+        sample('api_db_queries_per_request_sum', route=labels['route'])
+        > queries
+    )
+
+
+def test_connection_reuse(metrics_middleware, author_client, note_detail_url):
+    author_client.get(note_detail_url)
+    reused = sample(
+        'api_db_connections_total', alias='default', state='reused'
+    )
+
+    author_client.get(note_detail_url)
+
+    assert sample(
+        'api_db_connections_total', alias='default', state='reused'
+    ) == (reused + 1)
+
+
+def test_list_cache_hits(author_client, note_list_url):
+    hits = sample('api_cache_requests_total', cache='list', result='hit')
+    misses = sample('api_cache_requests_total', cache='list', result='miss')
+
+    author_client.get(note_list_url)
+    author_client.get(note_list_url)
+
+    assert sample('api_cache_requests_total', cache='list', result='hit') == (
+        hits + 1
+    )
+    assert sample('api_cache_requests_total', cache='list', result='miss') == (
+        misses + 1
+    )
+
+
+def test_metrics_aggregate_processes(tmp_path, monkeypatch):
+    apps_path = Path(django_settings.APPS_PATH)
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, '-c', RECORD_RESPONSE],
+            check=True,
+            cwd=apps_path,
+            env={'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)},
+        )
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+
+    assert (
+        'api_responses_total{method="GET",route="api:notes-list",'
+        'status="200"} 2.0'
+    ) in collect_metrics().decode()
+
+
+def test_metrics_staff(staff_client, metrics_url):
+    response = staff_client.get(metrics_url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'].startswith('text/plain')
+    assert b'api_cache_requests_total' in response.content
+
+
+def test_metrics_allowed_ip(client, metrics_url, settings):
+    settings.METRICS_ALLOWED_IPS = ['127.0.0.1']
+
+    assert client.get(metrics_url).status_code == status.HTTP_200_OK
+
+
+@mark.parametrize(
+    'user_client, expected_status',
+    [
+        (lf('client'), status.HTTP_401_UNAUTHORIZED),
+        (lf('author_client'), status.HTTP_403_FORBIDDEN),
+    ],
+)
+def test_metrics_forbidden(user_client, expected_status, metrics_url):
+    assert user_client.get(metrics_url).status_code == expected_status
@@ -0,0 +1,96 @@
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from pytest import mark
+from rest_framework import status
+
+from diary.models import Note
+
+pytestmark = mark.django_db
+
+
+@mark.parametrize('method', ['put', 'patch'])
+def test_update_if_match_version(
+    author_client, note_detail_url, new_note_data, some_note, method
+):
+    response = getattr(author_client, method)(
+        note_detail_url,
+        data=new_note_data,
+        headers={'If-Match': f'"{some_note.version}"'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['version'] == some_note.version + 1
+
+
+@mark.parametrize('method', ['put', 'patch'])
+def test_update_stale_version(
+    author_client, note_detail_url, new_note_data, some_note, method
+):
+    Note.objects.filter(id=some_note.id).update(version=F('version') + 1)
+
+    response = getattr(author_client, method)(
+        note_detail_url,
+        data=new_note_data,
+        headers={'If-Match': f'"{some_note.version}"'},
+    )
+
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert Note.objects.get(id=some_note.id).title == some_note.title
+
+
+def test_update_if_match_get_etag(author_client, note_detail_url, some_note):
+    etag = author_client.get(note_detail_url)['ETag']
+
+    first = author_client.patch(
+        note_detail_url, data={'text': 'first'}, headers={'If-Match': etag}
+    )
+    second = author_client.patch(
+        note_detail_url, data={'text': 'second'}, headers={'If-Match': etag}
+    )
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert Note.objects.get(id=some_note.id).text == 'first'
+
+
+@mark.parametrize('if_match', ['*', None])
+def test_update_unconditional(
+    author_client, note_detail_url, some_note, if_match
+):
+    headers = {'If-Match': if_match} if if_match else {}
+    Note.objects.filter(id=some_note.id).update(version=F('version') + 1)
+
+    response = author_client.patch(
+        note_detail_url, data={'text': 'changed'}, headers=headers
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['version'] == some_note.version + 2
+
+
+def test_update_checks_version_in_one_write(
+    author_client, note_detail_url, some_note
+):
+    with CaptureQueriesContext(connection) as queries:
+        author_client.patch(
+            note_detail_url,
+            data={'text': 'changed'},
+            headers={'If-Match': f'"{some_note.version}"'},
+        )
+    note_writes = [
+        query['sql']
+        for query in queries
+        if query['sql'].startswith('UPDATE "diary_note"')
+    ]
+
+    assert len(note_writes) == 1
+    assert '"diary_note"."version" = ' in note_writes[0]
+    assert not any('FOR UPDATE' in query['sql'] for query in queries)
+
+
+def test_patch_keeps_tags(author_client, note_detail_url, some_note, some_tag):
+    response = author_client.patch(note_detail_url, data={'text': 'changed'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert list(some_note.tags.all()) == [some_tag]
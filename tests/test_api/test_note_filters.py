@@ -0,0 +1,145 @@
+from datetime import date, datetime, timedelta, UTC
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest import fixture, mark
+from rest_framework import status
+
+from diary.models import Note
+
+pytestmark = mark.django_db
+
+# Midnight of the day in Moscow, the TIME_ZONE.
+DAY_START = datetime(2026, 3, 4, 21, tzinfo=UTC)
+
+
+@fixture
+def dated_notes(creative_user, create_note, some_tag):
+    created_ats = [
+        DAY_START - timedelta(minutes=1),
+        DAY_START,
+        DAY_START + timedelta(hours=23, minutes=59),
+        DAY_START + timedelta(days=1),
+    ]
+    notes = []
+    for index, created_at in enumerate(created_ats):
+        note = create_note(
+            author=creative_user,
+            title=f'note {"dcba"[index]}',
+            text='',
+            tags=[some_tag],
+        )
+        Note.objects.filter(id=note.id).update(created_at=created_at)
+        notes.append(note)
+    return notes
+
+
+@fixture
+def planner_prefers_indexes():
+    # Test tables are tiny, so the planner would rather scan and sort them.
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_sort = off')
+
+
+def titles(response) -> list[str]:
+    return [note['title'] for note in response.json()['results']]
+
+
+@mark.parametrize(
+    'params, expected_titles',
+    [
+        ({'on_date': date(2026, 3, 5)}, ['note b', 'note c']),
+        ({'created_after': '2026-03-05'}, ['note a', 'note b', 'note c']),
+        ({'created_before': '2026-03-05'}, ['note d']),
+        (
+            {
+                'created_after': '2026-03-05T00:00:00+03:00',
+                'created_before': '2026-03-06T00:00:00+03:00',
+            },
+            ['note b', 'note c'],
+        ),
+    ],
+)
+def test_date_filters(
+    author_client, note_list_url, dated_notes, params, expected_titles
+):
+    response = author_client.get(note_list_url, params)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(titles(response)) == expected_titles
+
+
+@mark.parametrize(
+    'ordering, expected_titles',
+    [
+        (None, ['note a', 'note b', 'note c', 'note d']),
+        ('created_at', ['note d', 'note c', 'note b', 'note a']),
+        ('title', ['note a', 'note b', 'note c', 'note d']),
+        ('-title', ['note d', 'note c', 'note b', 'note a']),
+    ],
+)
+def test_ordering(
+    author_client, note_list_url, dated_notes, ordering, expected_titles
+):
+    params = {'page_size': 2}
+    if ordering:
+        params['ordering'] = ordering
+
+    first_page = author_client.get(note_list_url, params).json()
+    second_page = author_client.get(first_page['next']).json()
+
+    assert [
+        note['title']
+        for page in (first_page, second_page)
+        for note in page['results']
+    ] == expected_titles
+
+
+def test_invalid_ordering(author_client, note_list_url):
+    response = author_client.get(note_list_url, {'ordering': 'text'})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'ordering' in response.json()
+
+
+@mark.usefixtures('planner_prefers_indexes')
+@mark.parametrize(
+    'params, index',
+    [
+        ({'on_date': '2026-03-05'}, 'note_author_created_at_idx'),
+        (
+            {'created_after': '2026-03-01', 'created_before': '2026-04-01'},
+            'note_author_created_at_idx',
+        ),
+        (
+            {'created_after': '2026-03-01', 'ordering': 'created_at'},
+            'note_author_created_at_idx',
+        ),
+        ({'ordering': 'title'}, '"Unique note title for author"'),
+        ({'ordering': '-title'}, '"Unique note title for author"'),
+    ],
+)
+def test_filters_use_index(
+    author_client, note_list_url, dated_notes, params, index
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.get(note_list_url, params)
+    note_queries = [
+        query['sql']
+        for query in queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "diary_note"' in query['sql']
+    ]
+    assert response.status_code == status.HTTP_200_OK
+    assert note_queries
+
+    plans = []
+    with connection.cursor() as cursor:
+        for sql in note_queries:
+            cursor.execute(f'EXPLAIN {sql}')
+            plans.append('\n'.join(row[0] for row in cursor.fetchall()))
+    assert not any('Seq Scan on diary_note ' in plan for plan in plans)
+    assert any(f'Index Scan using {index}' in plan for plan in plans) or any(
+        f'Index Scan Backward using {index}' in plan for plan in plans
+    )
@@ -0,0 +1,130 @@
+from datetime import datetime, UTC
+
+from django.core.management import call_command
+from pytest import fixture, mark
+from rest_framework import status
+
+from api.stats import rebuild_daily_stats
+from diary.models import Note, NoteDailyStats
+
+pytestmark = mark.django_db
+
+# Still January in UTC, but already February in Moscow.
+MONTH_EDGE = datetime(2026, 1, 31, 22, 30, tzinfo=UTC)
+
+
+@fixture
+def dated_notes(creative_user, some_tag, create_note):
+    notes = [
+        create_note(
+            author=creative_user, title=title, text=text, tags=[some_tag]
+        )
+        for title, text in (('first', 'abc'), ('second', 'de'))
+    ]
+    Note.objects.filter(id=notes[0].id).update(created_at=MONTH_EDGE)
+    Note.objects.filter(id=notes[1].id).update(
+        created_at=datetime(2026, 3, 5, 12, tzinfo=UTC)
+    )
+    return notes
+
+
+@fixture
+def rollup(settings):
+    settings.NOTE_STATS_ROLLUP = True
+
+
+def rollup_rows() -> list[tuple]:
+    return sorted(
+        NoteDailyStats.objects.filter(notes_count__gt=0).values_list(
+            'author', 'date', 'notes_count', 'text_length'
+        )
+    )
+
+
+@mark.parametrize(
+    'tz, timeline',
+    [
+        ('UTC', [('2026-01-01', 1), ('2026-03-01', 1)]),
+        ('Europe/Moscow', [('2026-02-01', 1), ('2026-03-01', 1)]),
+    ],
+)
+def test_monthly_stats_in_time_zone(
+    author_client, note_stats_url, dated_notes, some_tag, tz, timeline
+):
+    response = author_client.get(note_stats_url, {'period': 'month', 'tz': tz})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'period': 'month',
+        'tz': tz,
+        'notes_count': 2,
+        'text_length': 5,
+        'timeline': [
+            {'period': period, 'count': count} for period, count in timeline
+        ],
+        'tags': [{'name': some_tag.name, 'count': 2}],
+    }
+
+
+def test_stats_without_notes(author_client, note_stats_url):
+    response = author_client.get(note_stats_url)
+
+    assert response.json()['notes_count'] == 0
+    assert response.json()['text_length'] == 0
+    assert response.json()['timeline'] == []
+
+
+@mark.parametrize(
+    'params, error',
+    [
+        ({'period': 'year'}, {'period': ['Choose one of: day, week, month.']}),
+        ({'tz': 'Mars/Olympus'}, {'tz': ['Unknown time zone.']}),
+    ],
+)
+def test_stats_validation(author_client, note_stats_url, params, error):
+    response = author_client.get(note_stats_url, params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == error
+
+
+def test_rollup_matches_notes(
+    rollup,
+    author_client,
+    note_list_url,
+    note_bulk_url,
+    new_note_data,
+    creative_user,
+):
+    author_client.post(note_list_url, data=new_note_data)
+    author_client.post(
+        note_bulk_url,
+        data=[{'title': title, 'text': 'x' * 10} for title in 'abc'],
+        format='json',
+    )
+    note = Note.objects.get(title='a')
+    author_client.patch(
+        f'{note_list_url}{note.id}/',
+        data={'text': 'shorter', 'tags': []},
+        format='json',
+    )
+    author_client.delete(f'{note_list_url}{Note.objects.get(title="b").id}/')
+
+    rows = rollup_rows()
+    rebuild_daily_stats()
+
+    assert rows == rollup_rows()
+    assert rows[0][2] == 3
+
+
+def test_rollup_stats_match_live(
+    rollup, author_client, note_stats_url, dated_notes, settings
+):
+    call_command('rebuild_note_stats', stdout=None)
+    params = {'period': 'month', 'tz': settings.TIME_ZONE}
+    rollup_response = author_client.get(note_stats_url, params)
+
+    settings.NOTE_STATS_ROLLUP = False
+    live_response = author_client.get(note_stats_url, params)
+
+    assert rollup_response.json() == live_response.json()
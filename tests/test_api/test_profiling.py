@@ -0,0 +1,89 @@
+import json
+import logging
+
+from django.db import connection
+from pytest import fixture, mark
+from rest_framework import status
+
+from api.profiling import fingerprint, PROFILE_HISTOGRAM, RequestProfile
+from diary.models import Note
+
+pytestmark = mark.django_db
+
+
+@fixture(autouse=True)
+def profiling(settings):
+    settings.MIDDLEWARE = [
+        'api.profiling.ProfilingMiddleware',
+        *settings.MIDDLEWARE,
+    ]
+    PROFILE_HISTOGRAM.reset()
+    yield
+    PROFILE_HISTOGRAM.reset()
+
+
+def test_server_timing(author_client, note_detail_url):
+    response = author_client.get(note_detail_url)
+
+    timings = {
+        entry.split(';')[0]: entry
+        for entry in response['Server-Timing'].split(', ')
+    }
+    assert set(timings) == {'db', 'serializer', 'render', 'total'}
+    assert 'queries"' in timings['db']
+
+
+def test_profile_log(author_client, note_list_url, caplog):
+    with caplog.at_level(logging.INFO, logger='api.profiling'):
+        author_client.get(note_list_url)
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['route'] == 'GET api:notes-list'
+    assert record['status'] == status.HTTP_200_OK
+    assert record['queries'] > 0
+    assert record['duplicate_queries'] == {}
+
+
+def test_duplicate_queries(some_note, another_user):
+    profile = RequestProfile()
+
+    with connection.execute_wrapper(profile):
+        for user in (some_note.author, another_user):
+            list(Note.objects.filter(author=user))
+        Note.objects.count()
+
+    assert profile.query_count == 3
+    assert list(profile.duplicates().values()) == [2]
+
+
+def test_histogram(author_client, note_detail_url):
+    for _ in range(2):
+        author_client.get(note_detail_url)
+
+    stats = PROFILE_HISTOGRAM.snapshot()['GET api:notes-detail']
+    assert stats['count'] == 2
+    assert sum(stats['histogram'].values()) == 2
+    assert stats['avg_queries'] > 0
+
+
+def test_fingerprint_collapses_placeholders():
+    assert fingerprint('SELECT 1 WHERE id IN (%s, %s, %s)') == fingerprint(
+        'SELECT 1 WHERE id IN (%s)'
+    )
+
+
+def test_profiling_view(
+    staff_client, author_client, profiling_url, tag_list_url
+):
+    author_client.get(tag_list_url)
+
+    response = staff_client.get(profiling_url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['GET api:tags-list']['count'] == 1
+
+
+def test_profiling_view_non_staff(author_client, profiling_url):
+    response = author_client.get(profiling_url)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,66 @@
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from pytest import fixture, mark
+from rest_framework import status
+
+# Added by django_db_modify_db_settings in tests/conftest.py.
+REPLICA = 'replica'
+
+pytestmark = mark.django_db(transaction=True, databases=['default', REPLICA])
+
+
+@fixture(autouse=True)
+def replica_settings(settings):
+    settings.DATABASE_REPLICAS = [REPLICA]
+    return settings
+
+
+def capture_requests(client, method, url, **kwargs):
+    with (
+        CaptureQueriesContext(connections['default']) as primary,
+        CaptureQueriesContext(connections[REPLICA]) as replica,
+    ):
+        response = getattr(client, method)(url, **kwargs)
+    return response, len(primary), len(replica)
+
+
+@mark.usefixtures('some_note')
+@mark.parametrize('url_name', ['note_list_url', 'tag_list_url'])
+def test_reads_use_replica(
+    author_client, replica_settings, some_tag, url_name, request
+):
+    replica_settings.REPLICA_READ_YOUR_WRITES_WINDOW = 0
+
+    response, primary_count, replica_count = capture_requests(
+        author_client, 'get', request.getfixturevalue(url_name)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert some_tag.name in response.content.decode()
+    assert primary_count == 0
+    assert replica_count > 0
+
+
+@mark.usefixtures('some_note')
+def test_reads_after_own_write_use_primary(author_client, note_list_url):
+    response, primary_count, replica_count = capture_requests(
+        author_client, 'get', note_list_url
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert primary_count > 0
+    assert replica_count == 0
+
+
+def test_writes_use_primary(
+    author_client, replica_settings, tag_list_url, new_tag_data
+):
+    replica_settings.REPLICA_READ_YOUR_WRITES_WINDOW = 0
+
+    response, primary_count, replica_count = capture_requests(
+        author_client, 'post', tag_list_url, data=new_tag_data
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert primary_count > 0
+    assert replica_count == 0
@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from pytest import fixture, mark
+from rest_framework import status
+
+from api.sync import make_sync_token, SYNC_TOKEN_OVERLAP
+from diary.models import Note, Tag
+
+pytestmark = mark.django_db
+
+
+@fixture
+def old_token():
+    # Everything created by the test is newer than the token.
+    return make_sync_token(now() - SYNC_TOKEN_OVERLAP)
+
+
+@fixture
+def recent_token():
+    return make_sync_token(now() + SYNC_TOKEN_OVERLAP + timedelta(seconds=1))
+
+
+def test_first_sync_returns_everything(
+    author_client, sync_url, some_note, some_tag, note_to_json
+):
+    response = author_client.get(sync_url)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['token']
+    assert data['notes'] == [note_to_json(some_note)]
+    assert data['tags'] == [
+        {'id': some_tag.id, 'name': some_tag.name, 'notes_count': 1}
+    ]
+    assert data['deleted'] == {'notes': [], 'tags': []}
+
+
+def test_sync_returns_changes(
+    author_client, sync_url, old_token, some_note, some_tag
+):
+    deleted = {'notes': [some_note.id], 'tags': [some_tag.id]}
+    some_note.delete()
+    some_tag.delete()
+
+    response = author_client.get(sync_url, {'since': old_token})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['notes'] == []
+    assert data['tags'] == []
+    assert data['deleted'] == deleted
+
+
+def test_sync_skips_old_and_foreign_changes(
+    author_client, sync_url, some_note, another_user
+):
+    Tag.objects.create(author=another_user, name='foreign')
+    Note.objects.filter(id=some_note.id).update(
+        updated_at=now() - 2 * SYNC_TOKEN_OVERLAP
+    )
+    Tag.objects.filter(notes=some_note).update(
+        updated_at=now() - 2 * SYNC_TOKEN_OVERLAP
+    )
+    Note.objects.create(
+        author=some_note.author, title='new note', text='new text'
+    )
+
+    response = author_client.get(sync_url, {'since': make_sync_token(now())})
+
+    assert [note['title'] for note in response.json()['notes']] == ['new note']
+    assert response.json()['tags'] == []
+
+
+def test_sync_without_changes_takes_one_query(
+    author_client, sync_url, some_note, recent_token
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.get(sync_url, {'since': recent_token})
+    query_count = len(queries)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert query_count == 1
+    assert response.json() == {
+        'token': response.json()['token'],
+        'notes': [],
+        'tags': [],
+        'deleted': {'notes': [], 'tags': []},
+    }
+
+
+def test_tag_rename_syncs_its_notes(
+    author_client, sync_url, some_note, some_tag, tag_detail_url
+):
+    Note.objects.filter(id=some_note.id).update(
+        updated_at=now() - 2 * SYNC_TOKEN_OVERLAP
+    )
+    token = make_sync_token(now())
+
+    author_client.patch(tag_detail_url, data={'name': 'renamed'})
+    response = author_client.get(sync_url, {'since': token})
+
+    assert [note['tags'] for note in response.json()['notes']] == [['renamed']]
+
+
+def test_sync_token_validation(author_client, sync_url):
+    response = author_client.get(sync_url, {'since': 'yesterday'})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'since': ['Invalid sync token.']}
+
+
+def test_anonymous_sync(client, sync_url):
+    assert client.get(sync_url).status_code == status.HTTP_401_UNAUTHORIZED
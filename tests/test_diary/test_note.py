@@ -1,8 +1,9 @@
 from django.core.exceptions import ValidationError
-from django.db import DataError, IntegrityError
+from django.db import DataError, IntegrityError, transaction
 from pytest import mark, raises
 
 from diary.constants import MAX_TITLE_LENGTH
+from diary.models import DeletedRecord, Note, VersionConflict
 
 pytestmark = mark.django_db
 
@@ -37,3 +38,50 @@ def test_duplicate_title_different_users(
 ):
     create_note(**valid_note_data)
     create_note(**valid_note_data | {'author': another_user})
+
+
+def test_delete_leaves_tombstone(create_note, valid_note_data):
+    note = create_note(**valid_note_data)
+    note_id = note.id
+
+    note.delete()
+
+    assert DeletedRecord.objects.filter(
+        author=valid_note_data['author'], model_name='note', object_id=note_id
+    ).exists()
+
+
+def test_bulk_delete_leaves_tombstones(create_note, valid_note_data):
+    note_ids = [
+        create_note(**valid_note_data | {'title': title}).id
+        for title in ('first', 'second')
+    ]
+
+    Note.objects.filter(id__in=note_ids).delete()
+
+    assert sorted(
+        DeletedRecord.objects.filter(model_name='note').values_list(
+            'object_id', flat=True
+        )
+    ) == sorted(note_ids)
+
+
+def test_save_bumps_version(create_note, valid_note_data):
+    note = create_note(**valid_note_data)
+
+    note.save()
+
+    assert note.version == 2
+    assert Note.objects.get(id=note.id).version == 2
+
+
+def test_save_stale_version(create_note, valid_note_data):
+    note = create_note(**valid_note_data)
+    stale_note = Note.objects.get(id=note.id)
+    note.save()
+
+    stale_note.text = 'Lost write'
+    with raises(VersionConflict), transaction.atomic():
+        stale_note.save()
+
+    assert Note.objects.get(id=note.id).text == note.text
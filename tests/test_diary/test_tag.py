@@ -33,3 +33,17 @@ def test_duplicate_name_same_user(valid_tag_data):
 def test_duplicate_name_different_users(valid_tag_data, another_user):
     Tag.objects.create(**valid_tag_data)
     Tag.objects.create(**valid_tag_data | {'author': another_user})
+
+
+def test_get_or_create_many(valid_tag_data, creative_user, another_user):
+    existing_tag = Tag.objects.create(**valid_tag_data)
+    Tag.objects.create(**valid_tag_data | {'author': another_user})
+
+    tags = Tag.objects.get_or_create_many(
+        creative_user, [existing_tag.name, 'new_tag', 'new_tag']
+    )
+
+    assert sorted(tag.name for tag in tags) == ['new_tag', existing_tag.name]
+    assert existing_tag in tags
+    assert all(tag.author == creative_user for tag in tags)
+    assert Tag.objects.filter(author=creative_user).count() == 2